@@ -1,21 +1,125 @@
-from typing import List, Dict, Any, Tuple
-from itertools import combinations
-from collections import defaultdict
+from typing import List, Dict, Any, Tuple, Iterable, Optional, Callable
+from itertools import chain, combinations, product
+from collections import Counter, defaultdict
 import logging
 import concurrent.futures
+import multiprocessing
 import threading
-from data.models import Match
-from patterns.event_patterns import EventPatterns
+import numpy as np
+from data.models import Match, EVENT_TYPE_NAMES
+from patterns.event_patterns import EventCondition, EventPatterns, ScoreLookup
+from patterns.vectorized import compile_match_evaluator, evaluate_patterns
 from config.settings import AnalysisConfig
 from utils.results_manager import ResultsManager
 from utils.odds_calculator import OddsCalculator
 
 
+# Below this many matches in total, league shards are analyzed in-process (worker start-up would dominate)
+_MIN_MATCHES_FOR_PROCESSES = 200
+
+logger = logging.getLogger(__name__)
+
+
+def _occurring_pattern_names(patterns: List[EventCondition], match: Match,
+                             evaluate: Optional[Callable[[Match], List[str]]] = None) -> List[str]:
+    """Names of the patterns that occurred in this specific match"""
+    if evaluate is not None:
+        try:
+            return evaluate(match)
+        except Exception:
+            pass  # A condition failed on this match's data: check pattern by pattern to skip only those
+
+    occurring_patterns = []
+
+    for pattern in patterns:
+        try:
+            if pattern.condition(match):
+                occurring_patterns.append(pattern.name)
+        except Exception as e:
+            logger.debug("Error evaluating pattern %s for match %s: %s", pattern.name, match.id, e)
+            continue
+
+    return occurring_patterns
+
+
+def _build_occurrence_bitsets(patterns: List[EventCondition], matches: List[Match]) -> List[int]:
+    """Pattern x match occurrence matrix, one int per pattern with bit m set when it occurred in match m"""
+    try:
+        occurred = evaluate_patterns(patterns, matches)
+    except (AttributeError, TypeError, ValueError, OverflowError) as e:
+        # Scores that don't fit the int arrays (e.g. a missing half): evaluate match by match instead
+        logger.debug("Falling back to per-match pattern evaluation: %s", e)
+    else:
+        # Little-endian bit order puts match m at bit m of each row's int
+        return [int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little') for row in occurred]
+
+    index_by_name = {pattern.name: index for index, pattern in enumerate(patterns)}
+    evaluate = compile_match_evaluator(patterns)
+    bitsets = [0] * len(patterns)
+    for match_index, match in enumerate(matches):
+        match_bit = 1 << match_index
+        for pattern_name in _occurring_pattern_names(patterns, match, evaluate):
+            bitsets[index_by_name[pattern_name]] |= match_bit
+    return bitsets
+
+
+def _count_full_combinations(patterns: List[EventCondition], matches: List[Match],
+                             min_size: int, max_size: int) -> Counter:
+    """Count all occurring pattern combinations of these matches"""
+    return _count_bitset_combinations([pattern.name for pattern in patterns],
+                                      _build_occurrence_bitsets(patterns, matches), len(matches), min_size, max_size)
+
+
+def _count_bitset_combinations(names: List[str], bitsets: List[int], match_count: int,
+                               min_size: int, max_size: int) -> Counter:
+    """Count all occurring pattern combinations by ANDing pattern bitsets (popcount = matches in common)"""
+    # Patterns that never occurred can't be part of any counted combination
+    occurring = [(name, bits) for name, bits in zip(names, bitsets) if bits]
+    # buckets[size][first match]: the search visits combinations in lexicographic order, so reading the
+    # buckets back by first match, then size, reproduces the per-match counting order (and its tie-breaks)
+    buckets = [[[] for _ in range(match_count + 1)] for _ in range(max_size + 1)]
+
+    def extend(start: int, combo: Tuple[str, ...], common: int):
+        size = len(combo) + 1
+        # Loop invariants of this depth, looked up once instead of per candidate pattern
+        by_first_match = buckets[size] if size >= min_size else None
+        deeper = size < max_size
+        for index in range(start, len(occurring)):
+            name, bits = occurring[index]
+            extended_common = common & bits
+            if not extended_common:
+                continue  # No match has all of these, and neither will any larger combination
+            extended = combo + (name,)
+            if by_first_match is not None:
+                first_match = (extended_common & -extended_common).bit_length()
+                by_first_match[first_match].append((extended, extended_common.bit_count()))
+            if deeper:
+                extend(index + 1, extended, extended_common)
+
+    extend(0, (), (1 << match_count) - 1)
+
+    counts = Counter()
+    for first_match in range(1, match_count + 1):
+        for size in range(min_size, max_size + 1):
+            # Every combination is visited once, so plain dict.update (in C) replaces Counter's per-key adds
+            dict.update(counts, buckets[size][first_match])
+    return counts
+
+
+def _count_shard_combinations(config: AnalysisConfig, names: List[str], bitsets: List[int],
+                              match_count: int) -> Counter:
+    """Process-pool entry point: count one league/season's combinations from its occurrence bitsets"""
+    return _count_bitset_combinations(names, bitsets, match_count,
+                                      config.MIN_EVENTS_COMBINATION, config.MAX_EVENTS_COMBINATION)
+
+
 class PatternAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.all_patterns = EventPatterns.get_all_patterns()
+        self.score_lookup = ScoreLookup(self.all_patterns)
+        self.evaluate_match = compile_match_evaluator(self.all_patterns)
         self.results_manager = ResultsManager()
 
         # Initialize odds calculator
@@ -35,8 +139,8 @@ class PatternAnalyzer:
         # Threading
         self.thread_count = config.THREAD_COUNT
 
-        # Global shared dictionary with thread lock
-        self.global_combinations_dict = {}
+        # Global shared counts (combination tuple -> matches) with thread lock
+        self.global_combinations_dict = Counter()
         self.dict_lock = threading.Lock()
 
     def _organize_patterns(self):
@@ -87,27 +191,60 @@ class PatternAnalyzer:
         """Analyze matches league by league with comprehensive tracking"""
         leagues = set((m.league, m.league_id, m.season) for m in matches)
         league_results = {}
+        matches_by_league = {league: [m for m in matches if (m.league, m.league_id, m.season) == league]
+                             for league in leagues}
+        precomputed_counts = self._count_leagues_in_processes(matches_by_league)
 
         for league_name, league_id, season in leagues:
-            league_matches = [m for m in matches if
-                              m.league == league_name and m.league_id == league_id and m.season == season]
+            league_matches = matches_by_league[league_name, league_id, season]
             self.logger.info(f"Analyzing {len(league_matches)} matches in {league_name} ({season})")
             print(f"🚀 Starting analysis for {league_name} {season} with {len(league_matches)} matches")
 
             # Reset global dictionary for each league/season
-            self.global_combinations_dict = {}
+            self.global_combinations_dict = Counter()
 
             # Get all combinations analysis with optimized per-match approach
             all_combinations_analysis = self._analyze_matches_optimized(
-                league_matches, league_id, season, league_name
+                league_matches, league_id, season, league_name,
+                combination_counts=precomputed_counts.get((league_name, league_id, season))
             )
 
             league_results[f"{league_name}_{season}"] = all_combinations_analysis
 
         return league_results
 
-    def _analyze_matches_optimized(self, matches: List[Match], league_id: int, season: int, league_name: str) -> Dict[
-        str, Any]:
+    def _count_leagues_in_processes(self, matches_by_league: Dict[Tuple[str, int, int], List[Match]]) -> Dict[
+        Tuple[str, int, int], Counter]:
+        """Count full-strategy combinations for each league/season in a process pool (empty when not worth it)"""
+        total_matches = sum(len(league_matches) for league_matches in matches_by_league.values())
+        if (self.combination_strategy != "full" or self.config.PROCESS_COUNT < 2 or len(matches_by_league) < 2
+                or total_matches < _MIN_MATCHES_FOR_PROCESSES):
+            return {}
+
+        max_workers = min(self.config.PROCESS_COUNT, len(matches_by_league))
+        self.logger.info("⚙️ Counting combinations for %d league seasons in %d processes",
+                         len(matches_by_league), max_workers)
+        counts_by_league = {}
+        # Workers only need each shard's occurrence bitsets (one int per pattern), so the Match objects
+        # are evaluated here and never pickled across to the pool
+        names = [pattern.name for pattern in self.all_patterns]
+        try:
+            # Spawned rather than forked, so workers never inherit locks held by other threads of this process
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                        mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = {executor.submit(_count_shard_combinations, self.config, names,
+                                           _build_occurrence_bitsets(self.all_patterns, league_matches),
+                                           len(league_matches)): league
+                           for league, league_matches in matches_by_league.items()}
+                for future in concurrent.futures.as_completed(futures):
+                    counts_by_league[futures[future]] = future.result()
+        except Exception as e:
+            # Anything not counted here is simply counted in-process afterwards
+            self.logger.warning("Process pool analysis failed, continuing in-process: %s", e)
+        return counts_by_league
+
+    def _analyze_matches_optimized(self, matches: List[Match], league_id: int, season: int, league_name: str,
+                                   combination_counts: Optional[Counter] = None) -> Dict[str, Any]:
         """Optimized analysis using global shared dictionary - no combining needed!"""
         total_matches = len(matches)
 
@@ -117,34 +254,40 @@ class PatternAnalyzer:
         print(f"🎯 Processing {total_matches} matches for {league_name} {season}")
         print(f"🔢 Combination sizes: {self.config.MIN_EVENTS_COMBINATION} to {self.config.MAX_EVENTS_COMBINATION}")
 
-        # Process matches in batches using global dictionary
-        batch_size = max(1, len(matches) // (self.thread_count * 2))
+        if combination_counts is not None:
+            # Already counted in a worker process
+            self.global_combinations_dict = combination_counts
+            self.logger.info("🧮 Counted %d unique combinations from pattern bitsets", len(combination_counts))
+        elif self.combination_strategy == "full":
+            # Every combination of occurring patterns is counted at once from per-pattern match bitsets
+            self.global_combinations_dict = self._count_full_combinations(matches)
+            self.logger.info("🧮 Counted %d unique combinations from pattern bitsets",
+                             len(self.global_combinations_dict))
+        else:
+            # Process matches in batches using global dictionary
+            batch_size = max(1, len(matches) // (self.thread_count * 2))
+
+            batch_count = 0
+            for batch_start in range(0, len(matches), batch_size):
+                batch_count += 1
+                batch_end = min(batch_start + batch_size, len(matches))
+                match_batch = matches[batch_start:batch_end]
 
-        batch_count = 0
-        for batch_start in range(0, len(matches), batch_size):
-            batch_count += 1
-            batch_end = min(batch_start + batch_size, len(matches))
-            match_batch = matches[batch_start:batch_end]
+                print(f"\n📊 Processing batch {batch_count}: matches {batch_start}-{batch_end} of {len(matches)}")
 
-            print(f"\n📊 Processing batch {batch_count}: matches {batch_start}-{batch_end} of {len(matches)}")
+                # Process this batch - all threads write to global dictionary
+                self._process_batch_with_global_dict(match_batch)
 
-            # Process this batch - all threads write to global dictionary
-            self._process_batch_with_global_dict(match_batch)
+                print(f"✅ Batch {batch_count} complete: "
+                      f"{len(self.global_combinations_dict)} unique combinations so far")
 
-            print(f"✅ Batch {batch_count} complete: {len(self.global_combinations_dict)} unique combinations so far")
+            # No combining needed - we already have the final results in global_combinations_dict!
+            print(f"\n🎉 All batches processed")
 
-        # No combining needed - we already have the final results in global_combinations_dict!
-        print(f"\n🎉 All batches processed")
         valid_combinations_count = sum(self.global_combinations_dict.values())
 
-        # Convert string keys back to tuples for final processing
-        final_combinations_with_tuples = {}
-        for combo_key, count in self.global_combinations_dict.items():
-            combo_tuple = tuple(combo_key.split("|"))
-            final_combinations_with_tuples[combo_tuple] = count
-
         # Save final results for this league/season - USE THE LAZY VERSION
-        final_results = self._prepare_final_results_lazy(final_combinations_with_tuples, total_matches,
+        final_results = self._prepare_final_results_lazy(self.global_combinations_dict, total_matches,
                                                          valid_combinations_count, league_id, season)
         self.results_manager.save_analysis_results(league_id, season, final_results)
 
@@ -177,49 +320,41 @@ class PatternAnalyzer:
 
     def _analyze_match_batch_global(self, matches: List[Match]):
         """Analyze a batch of matches and write directly to global dictionary"""
-        # Local batch dictionary to reduce lock contention
-        local_batch_dict = {}
+        # Local batch counts to reduce lock contention
+        local_batch_dict = Counter()
 
         for match in matches:
             # Get patterns that occurred in this specific match
             occurring_patterns = self._get_occurring_patterns_for_match(match)
 
-            if not occurring_patterns:
-                continue
-
-            # Generate combinations only from patterns that actually occurred
-            for size in range(self.config.MIN_EVENTS_COMBINATION, self.config.MAX_EVENTS_COMBINATION + 1):
-                if len(occurring_patterns) < size:
-                    continue
-
-                # Generate combinations using the selected strategy
-                combinations_for_match = self._generate_valid_combinations(occurring_patterns, size)
-
-                # Count each combination in local batch dictionary
-                for combo in combinations_for_match:
-                    combo_key = "|".join(combo)  # Convert tuple to string
-                    local_batch_dict[combo_key] = local_batch_dict.get(combo_key, 0) + 1
+            if occurring_patterns:
+                self._count_combinations(occurring_patterns, local_batch_dict)
 
         # Merge local batch results into global dictionary (with lock)
         with self.dict_lock:
-            for combo_key, count in local_batch_dict.items():
-                self.global_combinations_dict[combo_key] = self.global_combinations_dict.get(combo_key, 0) + count
+            self.global_combinations_dict.update(local_batch_dict)
 
-    def _get_occurring_patterns_for_match(self, match: Match) -> List[str]:
-        """Get list of pattern names that occurred in this specific match"""
-        occurring_patterns = []
+    def _count_combinations(self, occurring_patterns: List[str], counts: Counter):
+        """Count every valid combination of one match's occurring patterns into counts"""
+        # Counter.update consumes the combination iterators in C, keyed directly by the pattern-name tuples
+        for size in range(self.config.MIN_EVENTS_COMBINATION, self.config.MAX_EVENTS_COMBINATION + 1):
+            if len(occurring_patterns) < size:
+                break
+            counts.update(self._generate_valid_combinations(occurring_patterns, size))
 
-        for pattern in self.all_patterns:
-            try:
-                if pattern.condition(match):
-                    occurring_patterns.append(pattern.name)
-            except Exception as e:
-                self.logger.debug(f"Error evaluating pattern {pattern.name} for match {match.id}: {e}")
-                continue
+    def _count_full_combinations(self, matches: List[Match]) -> Counter:
+        """Count all occurring pattern combinations of one league/season"""
+        return _count_full_combinations(self.all_patterns, matches,
+                                        self.config.MIN_EVENTS_COMBINATION, self.config.MAX_EVENTS_COMBINATION)
 
+    def _get_occurring_patterns_for_match(self, match: Match) -> List[str]:
+        """Get list of pattern names that occurred in this specific match"""
+        occurring_patterns = self.score_lookup.occurring_pattern_names(match)
+        if occurring_patterns is None:
+            return _occurring_pattern_names(self.all_patterns, match, self.evaluate_match)
         return occurring_patterns
 
-    def _generate_valid_combinations(self, occurring_patterns: List[str], size: int) -> List[Tuple[str, ...]]:
+    def _generate_valid_combinations(self, occurring_patterns: List[str], size: int) -> Iterable[Tuple[str, ...]]:
         """Generate valid combinations based on strategy from occurring patterns"""
         if self.combination_strategy == "by_event_type":
             return self._generate_combinations_by_event_type_from_occurring(occurring_patterns, size)
@@ -228,7 +363,7 @@ class PatternAnalyzer:
         else:  # full
             return self._generate_full_combinations_from_occurring(occurring_patterns, size)
 
-    def _generate_combinations_by_event_type_from_occurring(self, occurring_patterns: List[str], size: int) -> List[
+    def _generate_combinations_by_event_type_from_occurring(self, occurring_patterns: List[str], size: int) -> Iterable[
         Tuple[str, ...]]:
         """Generate combinations by event type from occurring patterns only"""
         # Group occurring patterns by event type
@@ -244,20 +379,12 @@ class PatternAnalyzer:
         if size > len(available_event_types):
             return []
 
-        valid_combinations = []
-
-        # Generate combinations of event types
-        for event_type_combo in combinations(available_event_types, size):
-            # Get patterns for each event type in the combination
-            pattern_choices = [patterns_by_type[event_type] for event_type in event_type_combo]
-
-            # Generate all combinations across the chosen event types
-            for pattern_names in self._product(*pattern_choices):
-                valid_combinations.append(tuple(pattern_names))
-
-        return valid_combinations
+        # Every pattern pick across each combination of event types, expanded lazily by itertools in C
+        return chain.from_iterable(
+            product(*[patterns_by_type[event_type] for event_type in event_type_combo])
+            for event_type_combo in combinations(available_event_types, size))
 
-    def _generate_combinations_by_market_from_occurring(self, occurring_patterns: List[str], size: int) -> List[
+    def _generate_combinations_by_market_from_occurring(self, occurring_patterns: List[str], size: int) -> Iterable[
         Tuple[str, ...]]:
         """Generate combinations by market from occurring patterns only"""
         # Group occurring patterns by market
@@ -273,37 +400,19 @@ class PatternAnalyzer:
         if size > len(available_markets):
             return []
 
-        valid_combinations = []
+        # Every pattern pick across each combination of markets, expanded lazily by itertools in C
+        return chain.from_iterable(
+            product(*[patterns_by_market[market] for market in market_combo])
+            for market_combo in combinations(available_markets, size))
 
-        # Generate combinations of markets
-        for market_combo in combinations(available_markets, size):
-            # Get patterns for each market in the combination
-            pattern_choices = [patterns_by_market[market] for market in market_combo]
-
-            # Generate all combinations across the chosen markets
-            for pattern_names in self._product(*pattern_choices):
-                valid_combinations.append(tuple(pattern_names))
-
-        return valid_combinations
-
-    def _generate_full_combinations_from_occurring(self, occurring_patterns: List[str], size: int) -> List[
+    def _generate_full_combinations_from_occurring(self, occurring_patterns: List[str], size: int) -> Iterable[
         Tuple[str, ...]]:
         """Generate all combinations from occurring patterns only"""
         if size > len(occurring_patterns):
             return []
 
-        return list(combinations(occurring_patterns, size))
-
-    def _product(self, *args):
-        """Custom product function to handle empty lists"""
-        if not args:
-            yield ()
-            return
-
-        first, rest = args[0], args[1:]
-        for item in first:
-            for product_rest in self._product(*rest):
-                yield (item,) + product_rest
+        # Lazy: callers only iterate once, so skip materializing millions of tuples into a list
+        return combinations(occurring_patterns, size)
 
     # -------------------------------------------------------------------------
     # --- COMBINATION PROCESSING (unchanged except odds condition)
@@ -320,7 +429,7 @@ class PatternAnalyzer:
                     pattern_details.append({
                         'name': pattern.name,
                         'description': pattern.description,
-                        'event_type': pattern.event_type.value,
+                        'event_type': EVENT_TYPE_NAMES[pattern.event_type],
                         'market': pattern.market
                     })
 
@@ -334,7 +443,6 @@ class PatternAnalyzer:
                 'events': pattern_details,
                 'combination_size': len(combo),
                 'occurrence_count': count,
-                'percentage': (count / total_matches) * 100 if total_matches > 0 else 0.0,
                 'strategy': self.combination_strategy,
                 'odds_info': odds_info
             })
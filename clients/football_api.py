@@ -1,11 +1,131 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import concurrent.futures
+import contextlib
+import gc
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable
 import logging
+from types import MappingProxyType
 from config.settings import APIConfig
 from data.models import Match, MatchEvent, EventType, TeamStats, HalfStats
-from utils.cache_manager import OrganizedCacheManager
+from utils.cache_manager import OrganizedCacheManager, LRUCache
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import TokenBucket
+from utils.serialization import loads
+
+__all__ = ['APIFootballClient']
+
+# API event types (lower-cased) to EventType, built once instead of per event
+_EVENT_TYPE_MAPPING = {
+    'goal': EventType.GOALS,
+    'penalty': EventType.GOALS,
+    'missed penalty': EventType.GOALS,
+    'card': EventType.CARDS,
+    'yellow card': EventType.CARDS,
+    'red card': EventType.CARDS,
+    'corner': EventType.CORNERS,
+    'subst': EventType.TEAM_STATS,
+    'var': EventType.TEAM_STATS,
+    'foul': EventType.FOULS,
+    'offside': EventType.OFFSIDES
+}
+
+# Event description templates, keyed by (type, detail) first and then by type alone
+_DESCRIPTION_BY_TYPE_DETAIL = {
+    ('Goal', 'Normal Goal'): "Goal by {player}",
+    ('Goal', 'Own Goal'): "Own goal by {player}",
+    ('Goal', 'Penalty'): "Penalty goal by {player}"
+}
+_DESCRIPTION_BY_TYPE = {
+    'Yellow Card': "Yellow Card for {player}",
+    'Red Card': "Red Card for {player}",
+    'Corner': "Corner kick"
+}
+
+# Fixture statuses that never have events or statistics to fetch
+_NO_EVENTS_STATUSES = frozenset({'NS', 'TBD', 'PST', 'CANC', 'AWD', 'WO'})
+
+# API-Football caps the `ids` filter of the fixtures endpoint at 20 fixtures per request
+_FIXTURE_IDS_PER_REQUEST = 20
+
+# Marks "cache not consulted yet" apart from a cache miss (None)
+_NOT_LOOKED_UP = object()
+
+# Shared read-only stand-in for missing nested objects, avoids a fresh {} per lookup
+_EMPTY = MappingProxyType({})
+
+# Leagues list per (BASE_URL, API_KEY) with its fetch time, shared by every client in the process
+_LEAGUES_BY_API: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern names drawn from a small vocabulary (leagues, teams, statuses) so duplicates share one object"""
+    return sys.intern(value) if value.__class__ is str else value
+
+
+def _build_match(match_data: Dict[str, Any]) -> Match:
+    """Build the basic Match for the fixed API fixture shape with straight subscripts (no .get fallbacks)"""
+    fixture = match_data['fixture']
+    league = match_data['league']
+    home = match_data['teams']['home']
+    away = match_data['teams']['away']
+    goals = match_data['goals']
+    venue = match_data['venue']
+    return Match(
+        id=fixture['id'],
+        league=_intern(league['name']),
+        league_id=league['id'],
+        season=league['season'],
+        date=fixture['date'],
+        home_team=_intern(home['name']),
+        home_team_id=home['id'],
+        away_team=_intern(away['name']),
+        away_team_id=away['id'],
+        score_home=goals['home'] or 0,
+        score_away=goals['away'] or 0,
+        status=_intern(fixture['status']['short']),
+        referee=fixture['referee'],
+        venue_id=venue['id'],
+        venue_city=venue['city']
+    )
+
+
+def _has_fixture_keys(fixture_data: Dict[str, Any]) -> bool:
+    """Whether a fixture has the keys every parse step relies on (fixture id and teams)"""
+    fixture = fixture_data.get('fixture')
+    return isinstance(fixture, dict) and 'id' in fixture and 'teams' in fixture_data
+
+
+# Batches currently being ingested (league seasons are parsed concurrently) and whether GC was on before the first
+_ingest_lock = threading.Lock()
+_ingest_depth = 0
+_gc_was_enabled = False
+
+
+@contextlib.contextmanager
+def _batch_ingest():
+    """Pause the cyclic GC while batches of matches are being built, resuming it when the last one finishes"""
+    global _ingest_depth, _gc_was_enabled
+    with _ingest_lock:
+        if _ingest_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _ingest_depth += 1
+    try:
+        yield
+    finally:
+        with _ingest_lock:
+            _ingest_depth -= 1
+            resume = _ingest_depth == 0 and _gc_was_enabled
+            if resume:
+                gc.enable()
+        if resume:
+            gc.collect()
 
 
 class APIFootballClient:
@@ -14,50 +134,105 @@ class APIFootballClient:
         self.session = requests.Session()
         self.session.headers.update({
             'x-rapidapi-key': config.API_KEY,
-            'x-rapidapi-host': 'v3.football.api-sports.io'
+            'x-rapidapi-host': 'v3.football.api-sports.io',
+            'Connection': 'keep-alive'
         })
+        # Pooled keep-alive connections so back-to-back calls reuse a warm TLS connection
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retries))
         self.logger = logging.getLogger(__name__)
-        self.last_request_time = 0
-        # Use organized cache manager
+        # Requests per minute as a token bucket shared by all worker threads
+        self._rate_limiter = TokenBucket(config.RATE_LIMIT, config.RATE_LIMIT / 60)
+        # Fast-fail (without spending tokens) while the API keeps failing
+        self._circuit_breaker = CircuitBreaker(config.CIRCUIT_BREAKER_THRESHOLD, config.CIRCUIT_BREAKER_COOLDOWN)
+        # Use organized cache manager, with a bounded in-memory tier for repeated requests
         self.cache = OrganizedCacheManager(cache_dir="api_cache", ttl=config.CACHE_TTL)
+        self._memory_cache = LRUCache(maxsize=config.MEMORY_CACHE_SIZE)
+
+    def _make_request(self, endpoint: str, params: Dict[str, Any],
+                      use_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """Make API request with error handling (optionally TTL-cached and revalidated with ETag/Last-Modified)"""
+        memory_key = (endpoint, tuple(sorted(params.items())))
+        api_response = self._memory_cache.get(memory_key)
+        if api_response is not None:
+            return api_response
+
+        cached = self.cache.get_api_response(endpoint, params) if use_cache else None
+        if cached and time.time() - cached['ts'] < self.cache.ttl:
+            api_response = loads(cached['body'])
+            self._memory_cache.set(memory_key, api_response)
+            return api_response
 
-    def _rate_limit(self):
-        """Implement rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 60 / self.config.RATE_LIMIT
+        # Expired but present: ask the server whether it changed instead of refetching it
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
 
-        if time_since_last < min_interval:
-            time.sleep(min_interval - time_since_last)
-        self.last_request_time = time.time()
+        if not self._circuit_breaker.allow():
+            self.logger.warning(f"Circuit open, skipping request for {endpoint}")
+            return loads(cached['body']) if cached else None
 
-    def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Make API request with error handling"""
-        self._rate_limit()
+        self._rate_limiter.acquire()
 
         try:
             url = f"{self.config.BASE_URL}/{endpoint}"
-            response = self.session.get(url, params=params, timeout=self.config.TIMEOUT)
+            response = self.session.get(url, params=params, headers=headers, timeout=self.config.TIMEOUT)
+            if cached and response.status_code == 304:
+                self._circuit_breaker.record_success()
+                self.cache.refresh_api_response(endpoint, params)
+                api_response = loads(cached['body'])
+                self._memory_cache.set(memory_key, api_response)
+                return api_response
+
             response.raise_for_status()
-            api_response = response.json()
+            self._circuit_breaker.record_success()
+            api_response = loads(response.content)
+
+            if use_cache:
+                self.cache.save_api_response(endpoint, params, api_response,
+                                             response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            self._memory_cache.set(memory_key, api_response)
             return api_response
 
         except requests.exceptions.RequestException as e:
+            # Transient 429/5xx and connection errors were already retried with backoff by the adapter
+            self._circuit_breaker.record_failure()
             self.logger.error(f"API request failed for {endpoint}: {e}")
+            # Serve the stale cached body, if any, rather than nothing
+            return loads(cached['body']) if cached else None
+        except ValueError as e:
+            self.logger.error(f"Invalid JSON response for {endpoint}: {e}")
             return None
 
     def get_leagues(self) -> List[Dict[str, Any]]:
-        """Get available leagues"""
-        response = self._make_request("leagues", {"current": "true"})
-        if response:
-            # Save league info to organized cache
-            for league_info in response.get("response", []):
-                league_id = league_info["league"]["id"]
-                self.cache.save_league_info(league_id, league_info)
-        return response.get("response", []) if response else []
+        """Get available leagues (memoized per API for CACHE_TTL, the list changes at most once a season)"""
+        api_key = (self.config.BASE_URL, self.config.API_KEY)
+        memoized = _LEAGUES_BY_API.get(api_key)
+        if memoized and time.monotonic() - memoized[0] < self.config.CACHE_TTL:
+            return memoized[1]
+
+        response = self._make_request("leagues", {"current": "true"}, use_cache=True)
+        if not response:
+            return []
+
+        leagues = response.get("response", [])
+        # Save league info to organized cache, writing the file once rather than once per new league
+        for league_info in leagues:
+            league_id = league_info["league"]["id"]
+            self.cache.save_league_info(league_id, league_info, defer_save=True)
+        self.cache.flush()
+        _LEAGUES_BY_API[api_key] = (time.monotonic(), leagues)
+        return leagues
 
     def get_matches(self, league_id: int, season: int, round: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get matches for a league and season"""
+        return list(self.iter_matches(league_id, season, round))
+
+    def iter_matches(self, league_id: int, season: int, round: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily yield matches for a league and season, straight from the cache when possible"""
         params = {'league': league_id, 'season': season}
         if round:
             params['round'] = round
@@ -66,21 +241,53 @@ class APIFootballClient:
         cached_matches = self.cache.get_league_matches(league_id, season)
         if cached_matches:
             self.logger.info(f"Using cached matches for league {league_id}, season {season}")
-            return [match_data['fixture_data'] for match_data in cached_matches.values()]
+            for match_data in cached_matches.values():
+                yield match_data['fixture_data']
+            return
 
-        # If not in cache, make API request
-        response = self._make_request("fixtures", params)
+        # If not in cache, make API request (TTL-cached and ETag-revalidated, which also covers round-filtered
+        # requests and seasons without fixtures, neither of which the organized cache can answer)
+        response = self._make_request("fixtures", params, use_cache=True)
         if response:
             matches_data = response.get("response", [])
             # Save matches to organized cache
             self.cache.save_matches(league_id, season, matches_data)
-            return matches_data
-        return []
+            yield from matches_data
+
+    def get_matches_bulk(self, pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], List[Dict[str, Any]]]:
+        """Get matches for several (league_id, season) pairs concurrently"""
+        return dict(self.iter_matches_bulk(pairs))
+
+    def iter_matches_bulk(self, pairs: List[Tuple[int, int]],
+                          ordered: bool = True) -> Iterator[Tuple[Tuple[int, int], List[Dict[str, Any]]]]:
+        """Fetch matches for several (league_id, season) pairs concurrently, yielding each once ready"""
+        # ordered=False yields in completion order, so one slow league doesn't hold up the rest
+        if not pairs:
+            return
 
-    def get_match_details(self, match_id: int, league_id: int, season: int) -> Dict[str, Any]:
+        max_workers = min(self.config.MAX_CONCURRENT_REQUESTS, len(pairs))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_matches, league_id, season): (league_id, season)
+                for league_id, season in pairs
+            }
+            for future in (futures if ordered else concurrent.futures.as_completed(futures)):
+                pair = futures[future]
+                try:
+                    fixtures = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch matches for league {pair[0]}, season {pair[1]}: {e}")
+                    fixtures = []
+                yield pair, fixtures
+
+    def get_match_details(self, match_id: int, league_id: int, season: int,
+                          cached_details: Any = _NOT_LOOKED_UP) -> Dict[str, Any]:
         """Get both events and statistics for a match, handling cache properly"""
-        # Check if we have complete match data in cache
-        match_details = self.cache.get_match_details(league_id, season, match_id)
+        # Check if we have complete match data in cache, unless the caller already did
+        if cached_details is _NOT_LOOKED_UP:
+            match_details = self.cache.get_match_details(league_id, season, match_id)
+        else:
+            match_details = cached_details
 
         needs_events = not match_details or 'events' not in match_details or not match_details['events']
         needs_stats = not match_details or 'statistics' not in match_details or not match_details['statistics']
@@ -93,199 +300,271 @@ class APIFootballClient:
         events_data = match_details.get('events', []) if match_details else []
         stats_data = match_details.get('statistics', []) if match_details else []
 
-        if needs_events:
-            params = {'fixture': match_id}
-            response = self._make_request("fixtures/events", params)
-            events_data = response.get("response", []) if response else []
-
-        if needs_stats:
-            params = {'fixture': match_id}
-            response = self._make_request("fixtures/statistics", params)
-            stats_data = response.get("response", []) if response else []
-
-        # Save to cache
-        self.cache.save_match_details(league_id, season, match_id, events_data, stats_data)
+        if needs_events and needs_stats:
+            # Both are missing: fetch them side by side instead of back to back
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                events_future = executor.submit(self._get_fixture_response, "fixtures/events", match_id)
+                stats_future = executor.submit(self._get_fixture_response, "fixtures/statistics", match_id)
+                events_data = events_future.result()
+                stats_data = stats_future.result()
+        elif needs_events:
+            events_data = self._get_fixture_response("fixtures/events", match_id)
+        elif needs_stats:
+            stats_data = self._get_fixture_response("fixtures/statistics", match_id)
+
+        # Save to cache (written out by the next cache flush)
+        self.cache.save_match_details(league_id, season, match_id, events_data, stats_data, defer_save=True)
 
         return {
             'events': events_data,
             'statistics': stats_data
         }
+
+    def _get_fixture_response(self, endpoint: str, match_id: int) -> List[Dict[str, Any]]:
+        """Fetch a per-fixture endpoint and return its response list"""
+        response = self._make_request(endpoint, {'fixture': match_id})
+        return response.get("response", []) if response else []
+
     def get_match_lineups(self, match_id: int) -> List[Dict[str, Any]]:
-        """Get lineups for a specific match"""
+        """Get lineups for a specific match (cached: lineups of a played match never change)"""
         params = {'fixture': match_id}
-        response = self._make_request("fixtures/lineups", params)
+        response = self._make_request("fixtures/lineups", params, use_cache=True)
         return response.get("response", []) if response else []
 
     def parse_match_data(self, match_data: Dict[str, Any]) -> Match:
         """Parse raw match data into comprehensive Match object"""
+        try:
+            match = _build_match(match_data)
+        except (KeyError, TypeError):
+            # Fixture deviates from the usual API shape (e.g. no venue): use the defensive builder
+            match = self._build_match_safely(match_data)
+
+        # Fetch and process additional data
+        self._enrich_match_data(match)
+        return match
+
+    def _build_match_safely(self, match_data: Dict[str, Any]) -> Match:
+        """Build the basic Match tolerating missing optional fixture fields"""
         fixture = match_data['fixture']
         league = match_data['league']
         teams = match_data['teams']
         goals = match_data['goals']
-        score = match_data.get('score', {})
+        venue = match_data.get('venue') or _EMPTY
 
         # Create basic match object
         match = Match(
             id=fixture['id'],
-            league=league['name'],
+            league=_intern(league['name']),
             league_id=league['id'],
             season=league['season'],
             date=fixture['date'],
-            home_team=teams['home']['name'],
+            home_team=_intern(teams['home']['name']),
             home_team_id=teams['home']['id'],
-            away_team=teams['away']['name'],
+            away_team=_intern(teams['away']['name']),
             away_team_id=teams['away']['id'],
             score_home=goals['home'] or 0,
             score_away=goals['away'] or 0,
-            status=fixture['status']['short'],
+            status=_intern(fixture['status']['short']),
             referee=fixture.get('referee'),
-            venue_id=match_data.get('venue', {}).get('id'),
-            venue_city=match_data.get('venue', {}).get('city')
+            venue_id=venue.get('id'),
+            venue_city=venue.get('city')
         )
-
-        # Fetch and process additional data
-        self._enrich_match_data(match)
         return match
 
+    def parse_matches(self, fixtures: Iterable[Dict[str, Any]]) -> List[Match]:
+        """Parse a batch of fixtures concurrently, skipping (and logging) the ones that fail"""
+        # get_matches already hands over a list; only materialize other iterables
+        if not isinstance(fixtures, list):
+            fixtures = list(fixtures)
+        # Drop malformed fixtures once up front instead of raising and logging per match
+        valid = [fixture_data for fixture_data in fixtures if _has_fixture_keys(fixture_data)]
+        if len(valid) < len(fixtures):
+            self.logger.warning("⚠️  Skipping %d fixtures without fixture id or teams", len(fixtures) - len(valid))
+        fixtures = valid
+        if not fixtures:
+            return []
+
+        # Pull missing events/statistics for up to 20 fixtures per call instead of 2 calls per fixture
+        self.prefetch_match_details(fixtures)
+
+        max_workers = min(self.config.MAX_CONCURRENT_REQUESTS, len(fixtures))
+        with _batch_ingest(), concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() keeps the fixture order; the rate limiter still bounds the API calls
+            parsed = list(executor.map(self._parse_fixture_safely, fixtures))
+
+        # One cache write for the whole batch instead of one per fetched match
+        self.cache.flush()
+        return [match for match in parsed if match is not None]
+
+    def prefetch_match_details(self, fixtures: List[Dict[str, Any]]):
+        """Fetch and cache events/statistics for fixtures missing them, in batched `ids` requests"""
+        missing = {}
+        for fixture_data in fixtures:
+            # Malformed fixtures are skipped here and reported by _parse_fixture_safely
+            fixture = fixture_data.get('fixture') or {}
+            league = fixture_data.get('league') or {}
+            match_id, league_id, season = fixture.get('id'), league.get('id'), league.get('season')
+            if match_id is None or league_id is None or season is None:
+                continue
+            if (fixture.get('status') or {}).get('short') in _NO_EVENTS_STATUSES:
+                continue
+            details = self.cache.get_match_details(league_id, season, match_id)
+            if not details or not details.get('events') or not details.get('statistics'):
+                missing[match_id] = (league_id, season)
+
+        if not missing:
+            return
+
+        self.logger.info(f"📦 Prefetching details for {len(missing)} matches")
+        for fixture_data in self.iter_fixtures_bulk(list(missing)):
+            match_id = (fixture_data.get('fixture') or {}).get('id')
+            if match_id not in missing:
+                continue
+            league_id, season = missing[match_id]
+            # Anything still empty is retried per fixture by get_match_details
+            self.cache.save_match_details(league_id, season, match_id,
+                                          fixture_data.get('events') or [],
+                                          fixture_data.get('statistics') or [],
+                                          defer_save=True)
+
+    def get_fixtures_bulk(self, match_ids: List[int]) -> List[Dict[str, Any]]:
+        """Get full fixtures (with events, statistics, lineups) for many ids, 20 per request"""
+        return list(self.iter_fixtures_bulk(match_ids))
+
+    def iter_fixtures_bulk(self, match_ids: List[int]) -> Iterator[Dict[str, Any]]:
+        """Fetch full fixtures through the `ids` filter concurrently, yielding them batch by batch"""
+        batch_size = _FIXTURE_IDS_PER_REQUEST
+        batches = [match_ids[i:i + batch_size] for i in range(0, len(match_ids), batch_size)]
+        if not batches:
+            return
+
+        max_workers = min(self.config.MAX_CONCURRENT_REQUESTS, len(batches))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = executor.map(
+                lambda batch: self._make_request("fixtures", {'ids': '-'.join(map(str, batch))}), batches)
+            for response in responses:
+                yield from (response.get("response", []) if response else [])
+
+    def _parse_fixture_safely(self, fixture_data: Dict[str, Any]) -> Optional[Match]:
+        """Parse one fixture, logging instead of raising on failure"""
+        try:
+            # %-style arguments are only formatted when INFO is enabled
+            teams = fixture_data['teams']
+            self.logger.info("🔄 Processing match %s: %s vs %s", fixture_data['fixture']['id'],
+                             teams['home']['name'], teams['away']['name'])
+
+            match = self.parse_match_data(fixture_data)
+
+            self.logger.info("✅ Processed match %s: %s vs %s", match.id, match.home_team, match.away_team)
+            return match
+
+        except Exception as e:
+            self.logger.error("❌ Failed to parse match data: %s", e)
+            return None
+
     def _enrich_match_data(self, match: Match):
         """Enrich match data with events, statistics, and detailed info"""
+        # Unplayed fixtures have nothing to fetch; give them empty halves and zero derived events
+        if match.status in _NO_EVENTS_STATUSES:
+            match.first_half = HalfStats()
+            match.second_half = HalfStats()
+            self._generate_derived_events(match)
+            return
+
         # Check if we have complete cached match data in organized cache
         match_details = self.cache.get_match_details(match.league_id, match.season, match.id)
-        if match_details and match_details.get('processed'):
-            # Load from organized cache
-            self._load_match_from_organized_cache(match, match_details)
+        if match_details and 'processed_match' in match_details:
+            # Load the parsed snapshot from organized cache
+            self._load_match_from_organized_cache(match, match_details['processed_match'])
             return
 
-        match_details = self.get_match_details(match.id, match.league_id, match.season)
+        match_details = self.get_match_details(match.id, match.league_id, match.season, match_details)
         events_data = match_details.get('events', [])
         stats_data = match_details.get('statistics', [])
 
         self._process_events(match, events_data)
         self._process_statistics(match, stats_data)
-        self._extract_half_stats(match, events_data)
         self._generate_derived_events(match)
 
-    def _load_match_from_organized_cache(self, match: Match, match_details: Dict[str, Any]):
-        """Load match data from organized cache"""
-        match.events = []
-        for event_dict in match_details.get('events', []):
-            try:
-                # Filter out parameters that MatchEvent doesn't accept
-                valid_params = ['event_type', 'type', 'value', 'team', 'minute', 'is_home', 'description']
-                filtered_event_dict = {k: v for k, v in event_dict.items() if k in valid_params}
-
-                # Handle both 'type' and 'event_type' parameter names
-                if 'type' in filtered_event_dict and 'event_type' not in filtered_event_dict:
-                    filtered_event_dict = filtered_event_dict.copy()
-                    filtered_event_dict['event_type'] = filtered_event_dict.pop('type')
-
-                # Convert string event_type back to EventType enum
-                if isinstance(filtered_event_dict.get('event_type'), str):
-                    # Map API event types to EventType enum values
-                    event_type_str = filtered_event_dict['event_type'].lower()
-                    event_type_mapping = {
-                        'goal': EventType.GOALS,
-                        'card': EventType.CARDS,
-                        'yellow card': EventType.CARDS,
-                        'red card': EventType.CARDS,
-                        'corner': EventType.CORNERS,
-                        'subst': EventType.TEAM_STATS,
-                        'var': EventType.TEAM_STATS,
-                        'foul': EventType.FOULS,
-                        'offside': EventType.OFFSIDES,
-                        'half_stats': EventType.HALF_STATS,
-                        'goals': EventType.GOALS,
-                        'cards': EventType.CARDS,
-                        'corners': EventType.CORNERS,
-                        'team_stats': EventType.TEAM_STATS,
-                        'fouls': EventType.FOULS,
-                        'offsides': EventType.OFFSIDES
-                    }
-
-                    if event_type_str in event_type_mapping:
-                        filtered_event_dict['event_type'] = event_type_mapping[event_type_str]
-                    else:
-                        # Default to TEAM_STATS for unknown event types
-                        filtered_event_dict['event_type'] = EventType.TEAM_STATS
-                        self.logger.warning(
-                            f"Unknown event type '{filtered_event_dict['event_type']}', defaulting to TEAM_STATS")
-
-                # Extract minute from 'time' field if it exists in original data
-                if 'minute' not in filtered_event_dict and 'time' in event_dict:
-                    time_data = event_dict.get('time', {})
-                    if 'elapsed' in time_data:
-                        filtered_event_dict['minute'] = time_data['elapsed']
-
-                # Ensure required 'value' parameter exists (default to 1 if missing)
-                if 'value' not in filtered_event_dict:
-                    filtered_event_dict['value'] = 1  # Default value for events
-
-                # Ensure required parameters exist
-                required_params = ['event_type', 'value']
-                for param in required_params:
-                    if param not in filtered_event_dict:
-                        self.logger.warning(f"Missing required parameter '{param}' in event, using default")
-                        if param == 'value':
-                            filtered_event_dict[param] = 1
-                        elif param == 'event_type':
-                            filtered_event_dict[param] = EventType.TEAM_STATS
-
-                event = MatchEvent(**filtered_event_dict)
-                match.events.append(event)
-            except Exception as e:
-                self.logger.warning(f"Failed to load event from cache: {e}")
-                continue
-
-        # Process statistics from cache
-        stats_data = match_details.get('statistics', [])
-        self._process_statistics(match, stats_data)
-
-        # Extract half stats from events
-        self._extract_half_stats(match, match_details.get('events', []))
-
-        # Generate derived events
-        self._generate_derived_events(match)
+        # Store the parsed match (normalized events, derived ones included, plus half
+        # and team stats) so later runs skip the raw API parsing
+        self.cache.save_processed_match(match.league_id, match.season, match.id, {
+            'events': [e.to_dict() for e in match.events],
+            'first_half': asdict(match.first_half),
+            'second_half': asdict(match.second_half),
+            'home_stats': asdict(match.home_stats) if match.home_stats else None,
+            'away_stats': asdict(match.away_stats) if match.away_stats else None
+        }, defer_save=True)
+
+    def _load_match_from_organized_cache(self, match: Match, snapshot: Dict[str, Any]):
+        """Hydrate match data from a parsed snapshot in the organized cache"""
+        match.events = [MatchEvent.from_dict(event) for event in snapshot['events']]
+        for event in match.events:
+            event.team = _intern(event.team)
+        match.first_half = HalfStats(**snapshot['first_half'])
+        match.second_half = HalfStats(**snapshot['second_half'])
+
+        home_stats = snapshot['home_stats']
+        away_stats = snapshot['away_stats']
+        match.home_stats = TeamStats(**home_stats) if home_stats else None
+        match.away_stats = TeamStats(**away_stats) if away_stats else None
 
     def _process_events(self, match: Match, events_data: List[Dict[str, Any]]):
-        """Process match events"""
+        """Process match events and the per-half counters in a single pass"""
+        first_half = HalfStats()
+        second_half = HalfStats()
+        # Hoisted out of the loop: each event reads team, time and type exactly once
+        home_team_id = match.home_team_id
+        events = match.events
+        event_type_mapping = _EVENT_TYPE_MAPPING
+
         for event_data in events_data:
-            event_type = self._classify_event_type(event_data)
-            if not event_type:
+            team = event_data.get('team')
+            time_data = event_data.get('time')
+            raw_type = event_data.get('type')
+            minute = time_data.get('elapsed') if time_data else None
+            is_home = (team.get('id') if team else None) == home_team_id
+
+            event_type = event_type_mapping.get(raw_type.lower()) if raw_type else None
+            if event_type:
+                events.append(MatchEvent(
+                    event_type=event_type,
+                    value=1,  # Count for discrete events
+                    team=_intern(team.get('name')) if team else None,
+                    minute=minute,
+                    is_home=is_home,
+                    description=self._get_event_description(event_data)
+                ))
+
+            # Half counters only use events with a known minute
+            if not minute:
                 continue
 
-            event = MatchEvent(
-                event_type=event_type,
-                value=1,  # Count for discrete events
-                team=event_data.get('team', {}).get('name'),
-                minute=event_data.get('time', {}).get('elapsed'),
-                is_home=event_data.get('team', {}).get('id') == match.home_team_id,
-                description=self._get_event_description(event_data)
-            )
-            match.events.append(event)
-
-    def _classify_event_type(self, event_data: Dict[str, Any]) -> Optional[EventType]:
-        """Classify event type from API data"""
-        event_type = event_data.get('type')
-        detail = event_data.get('detail')
-
-        event_type_mapping = {
-            'goal': EventType.GOALS,
-            'penalty': EventType.GOALS,
-            'missed penalty': EventType.GOALS,
-            'card': EventType.CARDS,
-            'yellow card': EventType.CARDS,
-            'red card': EventType.CARDS,
-            'corner': EventType.CORNERS,
-            'subst': EventType.TEAM_STATS,
-            'var': EventType.TEAM_STATS,
-            'foul': EventType.FOULS,
-            'offside': EventType.OFFSIDES
-        }
+            half = first_half if minute <= 45 else second_half
 
-        if event_type and event_type.lower() in event_type_mapping:
-            return event_type_mapping[event_type.lower()]
+            # Count goals
+            if raw_type == 'Goal':
+                if is_home:
+                    half.home_goals += 1
+                else:
+                    half.away_goals += 1
 
-        return None
+            # Count cards
+            elif raw_type in ('Yellow Card', 'Red Card'):
+                if is_home:
+                    half.home_cards += 1
+                else:
+                    half.away_cards += 1
+
+            # Count corners
+            elif raw_type == 'Corner':
+                if is_home:
+                    half.home_corners += 1
+                else:
+                    half.away_corners += 1
+
+        match.first_half = first_half
+        match.second_half = second_half
 
     def _get_event_description(self, event_data: Dict[str, Any]) -> str:
         """Generate descriptive text for event"""
@@ -293,17 +572,9 @@ class APIFootballClient:
         detail = event_data.get('detail', '')
         player = event_data.get('player', {}).get('name', '')
 
-        if event_type == 'Goal':
-            if detail == 'Normal Goal':
-                return f"Goal by {player}"
-            elif detail == 'Own Goal':
-                return f"Own goal by {player}"
-            elif detail == 'Penalty':
-                return f"Penalty goal by {player}"
-        elif event_type in ['Yellow Card', 'Red Card']:
-            return f"{event_type} for {player}"
-        elif event_type == 'Corner':
-            return "Corner kick"
+        template = _DESCRIPTION_BY_TYPE_DETAIL.get((event_type, detail)) or _DESCRIPTION_BY_TYPE.get(event_type)
+        if template:
+            return template.format(player=player)
 
         return f"{event_type}: {detail}"
 
@@ -346,43 +617,6 @@ class APIFootballClient:
             else:
                 match.away_stats = team_stats_obj
 
-    def _extract_half_stats(self, match: Match, events_data: List[Dict[str, Any]]):
-        """Extract statistics for each half from events"""
-        first_half = HalfStats()
-        second_half = HalfStats()
-
-        for event in events_data:
-            minute = event.get('time', {}).get('elapsed')
-            if not minute:
-                continue
-
-            is_home = event.get('team', {}).get('id') == match.home_team_id
-            half = first_half if minute <= 45 else second_half
-
-            # Count goals
-            if event.get('type') == 'Goal':
-                if is_home:
-                    half.home_goals += 1
-                else:
-                    half.away_goals += 1
-
-            # Count cards
-            elif event.get('type') in ['Yellow Card', 'Red Card']:
-                if is_home:
-                    half.home_cards += 1
-                else:
-                    half.away_cards += 1
-
-            # Count corners
-            elif event.get('type') == 'Corner':
-                if is_home:
-                    half.home_corners += 1
-                else:
-                    half.away_corners += 1
-
-        match.first_half = first_half
-        match.second_half = second_half
-
     def _generate_derived_events(self, match: Match):
         """Generate derived events for pattern analysis"""
         # Half-time result events
@@ -424,23 +658,31 @@ class APIFootballClient:
 
     def _safe_convert_stat(self, value: Any) -> Any:
         """Safely convert statistic values"""
+        # Fast paths: the API sends most statistics as JSON numbers or null
+        value_type = type(value)
+        if value_type is int or value_type is float:
+            return value
         if value is None:
             return 0
-        if isinstance(value, (int, float)):
-            return value
-        if isinstance(value, str):
-            # Handle percentage values
-            if '%' in value:
-                try:
-                    return float(value.replace('%', ''))
-                except (ValueError, TypeError):
-                    return 0.0
-            # Handle numeric strings
+        if value_type is not str:
+            return value if isinstance(value, (int, float)) else 0
+
+        # Handle percentage values
+        if '%' in value:
             try:
-                return int(value)
-            except (ValueError, TypeError):
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return 0
-        return 0
\ No newline at end of file
+                return float(value.replace('%', ''))
+            except ValueError:
+                return 0.0
+
+        # Plain integer strings convert without raising
+        if value.isdecimal():
+            return int(value)
+
+        # Handle other numeric strings (signs, decimals, padding)
+        try:
+            return float(value) if '.' in value else int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return 0
@@ -1,6 +1,8 @@
 import os
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List
+
+__all__ = ['APIConfig', 'AnalysisConfig', 'Config']
 
 
 @dataclass
@@ -10,6 +12,10 @@ class APIConfig:
     RATE_LIMIT: int = 10  # requests per minute
     TIMEOUT: int = 30
     CACHE_TTL: int = 3600 * 4
+    MAX_CONCURRENT_REQUESTS: int = 8  # Parallel API calls (still bounded by RATE_LIMIT)
+    MEMORY_CACHE_SIZE: int = 4096  # API responses kept in memory for the current run
+    CIRCUIT_BREAKER_THRESHOLD: int = 5  # Consecutive failed requests before pausing the API
+    CIRCUIT_BREAKER_COOLDOWN: int = 60  # Seconds to stop calling the API once the breaker opens
 
 
 @dataclass
@@ -26,6 +32,9 @@ class AnalysisConfig:
     SEASON: List[int] = field(default_factory=lambda: [2022, 2023, 2024])
     PAST_YEARS: int = 1
     THREAD_COUNT: int = 1  # Number of threads for parallel processing
+    PROCESS_COUNT: int = os.cpu_count() or 1  # Worker processes for analyzing several league seasons at once
+    # Set STRATEGY_QUIET to skip the printed report; read when the config is created, not at import
+    PRINT_RESULTS: bool = field(default_factory=lambda: not os.getenv("STRATEGY_QUIET"))
 
 
 @dataclass
@@ -1,23 +1,36 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
-from enum import Enum
-from datetime import datetime
+from enum import IntEnum
 
+__all__ = ['EventType', 'EVENT_TYPE_NAMES', 'EVENT_TYPE_BY_KEY', 'MatchEvent', 'TeamStats', 'HalfStats', 'Match',
+           'EventPattern']
 
-class EventType(Enum):
-    GOALS = "goals"
-    CARDS = "cards"
-    CORNERS = "corners"
-    SHOTS = "shots"
-    POSSESSION = "possession"
-    FOULS = "fouls"
-    OFFSIDES = "offsides"
-    PASSES = "passes"
-    HALF_STATS = "half_stats"
-    TEAM_STATS = "team_stats"
 
+class EventType(IntEnum):
+    GOALS = 1
+    CARDS = 2
+    CORNERS = 3
+    SHOTS = 4
+    POSSESSION = 5
+    FOULS = 6
+    OFFSIDES = 7
+    PASSES = 8
+    HALF_STATS = 9
+    TEAM_STATS = 10
 
-@dataclass
+
+# Lower-case names, the string form shown in results (and stored by older caches)
+EVENT_TYPE_NAMES = {event_type: event_type.name.lower() for event_type in EventType}
+
+# Every persisted form (int value, lower-case name, enum name) back to its EventType
+EVENT_TYPE_BY_KEY = {
+    **{event_type.value: event_type for event_type in EventType},
+    **{name: event_type for event_type, name in EVENT_TYPE_NAMES.items()},
+    **{event_type.name: event_type for event_type in EventType}
+}
+
+
+@dataclass(slots=True)
 class MatchEvent:
     event_type: EventType
     value: Any
@@ -38,19 +51,17 @@ class MatchEvent:
             data = data.copy()
             data['event_type'] = data.pop('type')
 
-        # Convert string event_type back to EventType enum if needed
-        if isinstance(data.get('event_type'), str):
-            try:
-                data['event_type'] = EventType(data['event_type'])
-            except ValueError:
-                # Handle unknown event types gracefully
-                data['event_type'] = EventType.TEAM_STATS  # default
+        # Convert a persisted int/string event_type back to EventType if needed
+        event_type = data.get('event_type')
+        if not isinstance(event_type, EventType):
+            # Unknown event types default to TEAM_STATS; a copy, so the caller's dict keeps its stored form
+            data = {**data, 'event_type': EVENT_TYPE_BY_KEY.get(event_type, EventType.TEAM_STATS)}
 
         return cls(**data)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            'event_type': self.event_type.value,  # Save as string for JSON
+            'event_type': self.event_type.value,  # Save as int for compact JSON
             'value': self.value,
             'team': self.team,
             'minute': self.minute,
@@ -59,7 +70,7 @@ class MatchEvent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamStats:
     team_id: int
     team_name: str
@@ -81,7 +92,7 @@ class TeamStats:
     passes_percentage: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class HalfStats:
     home_goals: int = 0
     away_goals: int = 0
@@ -91,7 +102,7 @@ class HalfStats:
     away_corners: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Match:
     id: int
     league: str
@@ -136,14 +147,14 @@ class Match:
             'score_away': self.score_away,
             'status': self.status,
             'events': [e.to_dict() for e in self.events],
-            'home_stats': self.home_stats.__dict__ if self.home_stats else {},
-            'away_stats': self.away_stats.__dict__ if self.away_stats else {},
-            'first_half': self.first_half.__dict__,
-            'second_half': self.second_half.__dict__
+            'home_stats': asdict(self.home_stats) if self.home_stats else {},
+            'away_stats': asdict(self.away_stats) if self.away_stats else {},
+            'first_half': asdict(self.first_half),
+            'second_half': asdict(self.second_half)
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EventPattern:
     events: List[MatchEvent]
     occurrence_count: int
@@ -1,549 +1,769 @@
-from typing import List, Callable
+import operator
+import sys
+from typing import Any, Dict, FrozenSet, Hashable, List, Callable, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from data.models import Match, EventType
 
+# Markets whose conditions read the per-half goals (and nothing else) rather than only the full-time result
+HALF_TIME_MARKETS = frozenset({
+    "score_both_halves", "win_either_half", "win_both_halves", "highest_scoring_half", "btts_both_halves"
+})
 
-@dataclass
+# Markets in which at most one pattern holds for any match, so a scan can stop at the first hit
+EXCLUSIVE_MARKETS = frozenset({
+    "1x2", "total_goals_exact", "btts", "win_to_nil", "goal_range", "teams_to_score", "exact_goals_home",
+    "exact_goals_away", "winning_margin", "win_both_halves", "highest_scoring_half", "btts_both_halves",
+    "no_draw_btts"
+})
+
+# Full-time scorelines (per team) precomputed by ScoreLookup; anything higher is classified market by market
+SCORE_TABLE_MAX_GOALS = 10
+
+# Full-time markets partition scorelines on a small key: every scoreline with the same key satisfies the same
+# patterns of that market, so larger values are clamped onto the last key that still tells them apart
+_MARKET_KEYS: Dict[str, Callable[[int, int], Hashable]] = {
+    "total_goals_exact": lambda h, a: min(h + a, 5),
+    "total_goals_over_under": lambda h, a: min(h + a, 6),
+    "btts": lambda h, a: (min(h, 1), min(a, 1)),
+    "clean_sheet": lambda h, a: (min(h, 1), min(a, 1)),
+    "win_to_nil": lambda h, a: (min(h, 1), min(a, 1)),
+    "team_total_goals_home": lambda h, a: min(h, 3),
+    "team_total_goals_away": lambda h, a: min(a, 3),
+    "goal_range": lambda h, a: min(h + a, 7),
+    "teams_to_score": lambda h, a: (min(h, 1), min(a, 1)),
+    "odd_even": lambda h, a: (h % 2, a % 2),
+    "exact_goals_home": lambda h, a: min(h, 3),
+    "exact_goals_away": lambda h, a: min(a, 3),
+    "winning_margin": lambda h, a: max(-3, min(h - a, 3)),
+    "no_draw_btts": lambda h, a: (h == a, min(h, 1), min(a, 1)),
+    "goal_bounds": lambda h, a: min(h + a, 5),
+    "excluded_goals": lambda h, a: min(h + a, 5),
+    "multigoals": lambda h, a: min(h + a, 7),
+}
+
+
+# Operators of the (column, operator, operand) comparisons patterns declare with compare=. Each one holds for a
+# single score and for a numpy array of scores alike, so per-match and batch evaluation read the same row
+COMPARISON_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "between": lambda value, bounds: (value >= bounds[0]) & (value <= bounds[1]),
+    "parity": lambda value, remainder: value % 2 == remainder,
+}
+
+
+# Goal columns of MatchScores and ScoreArrays: the full-time ones only read the final score
+FULL_TIME_COLUMNS = frozenset({"home", "away", "total", "margin"})
+HALF_TIME_COLUMNS = frozenset({"first_home", "first_away", "second_home", "second_away"})
+
+
+class MatchScores:
+    """One match's goals under the column names of patterns.vectorized.ScoreArrays, read on access"""
+    __slots__ = ("match",)
+
+    def __init__(self, match: Match):
+        self.match = match
+
+    @property
+    def home(self) -> int:
+        return self.match.score_home
+
+    @property
+    def away(self) -> int:
+        return self.match.score_away
+
+    @property
+    def total(self) -> int:
+        return self.match.score_home + self.match.score_away
+
+    @property
+    def margin(self) -> int:
+        return self.match.score_home - self.match.score_away
+
+    @property
+    def first_home(self) -> int:
+        return self.match.first_half.home_goals
+
+    @property
+    def first_away(self) -> int:
+        return self.match.first_half.away_goals
+
+    @property
+    def second_home(self) -> int:
+        return self.match.second_half.home_goals
+
+    @property
+    def second_away(self) -> int:
+        return self.match.second_half.away_goals
+
+
+class _ColumnProbe:
+    """Stand-in goals that record which columns a scores condition reads"""
+    __slots__ = ("read",)
+
+    def __init__(self):
+        self.read = set()
+
+    def __getattr__(self, column: str) -> int:
+        if column not in FULL_TIME_COLUMNS and column not in HALF_TIME_COLUMNS:
+            raise AttributeError(column)
+        self.read.add(column)
+        return 0
+
+
+def _columns_read(scores: Callable[[Any], Any]) -> FrozenSet[str]:
+    """Goal columns a scores condition reads; scores hold for arrays, so they can't branch on a column"""
+    probe = _ColumnProbe()
+    scores(probe)
+    return frozenset(probe.read)
+
+
+# Human-readable pattern descriptions by name, kept off the condition objects scanned per match
+_DESCRIPTIONS: Dict[str, str] = {}
+
+# Patterns declared so far by name, for building the complements that name them in negate_of
+_DECLARED: Dict[str, 'EventCondition'] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class EventCondition:
     name: str
-    description: str
     market: str
     event_type: EventType
     condition: Callable[[Match], bool]
+    # Name of the pattern this one is the exact complement of, so evaluators can invert that result instead
+    negate_of: Optional[str] = None
+    # Whether the condition reads per-half goals, not just the full-time score
+    needs_halves: bool = False
+    # The condition on goal columns (home, away, total, margin, first_home, ...), written with operators that
+    # hold for one match's goals and for a whole ScoreArrays batch alike; None if it reads anything else
+    scores: Optional[Callable[[Any], Any]] = None
+    # The (column, operator, operand) row that scores applies, for patterns declared as a single comparison
+    comparison: Optional[Tuple[str, str, Any]] = None
+    # Goal columns the condition reads, known from its scores or compare declaration (or its complement's);
+    # None when the condition is an arbitrary match function that may read anything
+    columns: Optional[FrozenSet[str]] = None
+
+    @property
+    def reads_full_time_score(self) -> bool:
+        """Whether the declaration proves the condition reads the full-time score and nothing else"""
+        return self.columns is not None and self.columns <= FULL_TIME_COLUMNS
+
+    @property
+    def description(self) -> str:
+        return _DESCRIPTIONS.get(self.name, self.name)
+
+
+def _comparison_scores(comparison: Tuple[str, str, Any]) -> Callable[[Any], Any]:
+    """Goal-column condition of a (column, operator, operand) row"""
+    column, name, operand = comparison
+    read, compare = operator.attrgetter(column), COMPARISON_OPERATORS[name]
+    return lambda s: compare(read(s), operand)
+
+
+def _pattern(name: str, description: str, market: str, event_type: EventType,
+             condition: Optional[Callable[[Match], bool]] = None, negate_of: Optional[str] = None,
+             scores: Optional[Callable[[Any], Any]] = None,
+             compare: Optional[Tuple[str, str, Any]] = None) -> EventCondition:
+    """Declare a pattern, filing its description in _DESCRIPTIONS.
+
+    The condition is given as a match function, as goal-column scores, as a compare row, or as negate_of, the
+    complement of another pattern. Scores and compare rows also build the match condition, so the per-match
+    and the array evaluators share one declaration.
+    """
+    columns = None
+    if compare is not None:
+        scores = _comparison_scores(compare)
+        columns = frozenset({compare[0]})
+    elif scores is not None:
+        columns = _columns_read(scores)
+    if scores is not None:
+        condition = lambda m: scores(MatchScores(m))
+    if negate_of is not None:
+        source = _DECLARED[negate_of].condition
+        condition = lambda m: not source(m)
+        columns = _DECLARED[negate_of].columns
+    if columns is not None:
+        needs_halves = not columns <= FULL_TIME_COLUMNS
+    else:
+        needs_halves = market in HALF_TIME_MARKETS or event_type is EventType.HALF_STATS
+    # Interned so every pattern of a market shares one string object and market comparisons are identity checks
+    pattern = EventCondition(name, sys.intern(market), event_type, condition, negate_of, needs_halves, scores,
+                             compare, columns)
+    _DESCRIPTIONS[name] = description
+    _DECLARED[name] = pattern
+    return pattern
+
+
+def _goal_pattern(name: str, description: str, market: str, condition: Optional[Callable[[Match], bool]] = None,
+                  negate_of: Optional[str] = None, scores: Optional[Callable[[Any], Any]] = None,
+                  compare: Optional[Tuple[str, str, Any]] = None) -> EventCondition:
+    """Declare a GOALS pattern, the event type of every pattern currently enabled"""
+    return _pattern(name, description, market, EventType.GOALS, condition, negate_of, scores, compare)
+
+
+# Goal-column conditions that several markets share, so array evaluators compute them once
+def _both_teams_score(s: Any) -> Any:
+    return (s.home > 0) & (s.away > 0)
+
+
+def _only_home_scores(s: Any) -> Any:
+    return (s.home > 0) & (s.away == 0)
+
+
+def _only_away_scores(s: Any) -> Any:
+    return (s.away > 0) & (s.home == 0)
+
+
+# Conditions call EventPatterns helpers by name, which resolves once the class below exists
+_ALL_PATTERNS: Tuple[EventCondition, ...] = (
+    # =============================================================
+    # --- GOALS MARKETS ---
+    # =============================================================
+
+    # --- total_goals_exact ---
+    _goal_pattern("total_goals_0", "Total goals = 0", "total_goals_exact",
+                  compare=("total", "==", 0)),
+    _goal_pattern("total_goals_1", "Total goals = 1", "total_goals_exact",
+                  compare=("total", "==", 1)),
+    _goal_pattern("total_goals_2", "Total goals = 2", "total_goals_exact",
+                  compare=("total", "==", 2)),
+    _goal_pattern("total_goals_3", "Total goals = 3", "total_goals_exact",
+                  compare=("total", "==", 3)),
+    _goal_pattern("total_goals_4", "Total goals = 4", "total_goals_exact",
+                  compare=("total", "==", 4)),
+    _goal_pattern("total_goals_5_plus", "Total goals ≥ 5", "total_goals_exact",
+                  compare=("total", ">=", 5)),
+
+    # --- total_goals_over_under ---
+    _goal_pattern("over_0_5_goals", "Total goals over 0.5", "total_goals_over_under",
+                  compare=("total", ">", 0.5)),
+    _goal_pattern("over_1_5_goals", "Total goals over 1.5", "total_goals_over_under",
+                  compare=("total", ">", 1.5)),
+    _goal_pattern("over_2_5_goals", "Total goals over 2.5", "total_goals_over_under",
+                  compare=("total", ">", 2.5)),
+    _goal_pattern("over_3_5_goals", "Total goals over 3.5", "total_goals_over_under",
+                  compare=("total", ">", 3.5)),
+    _goal_pattern("over_4_5_goals", "Total goals over 4.5", "total_goals_over_under",
+                  compare=("total", ">", 4.5)),
+    _goal_pattern("over_5_5_goals", "Total goals over 5.5", "total_goals_over_under",
+                  compare=("total", ">", 5.5)),
+    _goal_pattern("under_0_5_goals", "Total goals under 0.5", "total_goals_over_under",
+                  compare=("total", "<", 0.5)),
+    _goal_pattern("under_1_5_goals", "Total goals under 1.5", "total_goals_over_under",
+                  compare=("total", "<", 1.5)),
+    _goal_pattern("under_2_5_goals", "Total goals under 2.5", "total_goals_over_under",
+                  compare=("total", "<", 2.5)),
+    _goal_pattern("under_3_5_goals", "Total goals under 3.5", "total_goals_over_under",
+                  compare=("total", "<", 3.5)),
+    _goal_pattern("under_4_5_goals", "Total goals under 4.5", "total_goals_over_under",
+                  compare=("total", "<", 4.5)),
+    _goal_pattern("under_5_5_goals", "Total goals under 5.5", "total_goals_over_under",
+                  compare=("total", "<", 5.5)),
+
+    # --- btts ---
+    _goal_pattern("btts_yes", "Both teams to score (Yes)", "btts",
+                  scores=_both_teams_score),
+    _goal_pattern("btts_no", "Both teams to score (No)", "btts", negate_of="btts_yes"),
+
+    # --- clean_sheet ---
+    _goal_pattern("clean_sheet_home", "Home team clean sheet", "clean_sheet",
+                  compare=("away", "==", 0)),
+    _goal_pattern("clean_sheet_away", "Away team clean sheet", "clean_sheet",
+                  compare=("home", "==", 0)),
+
+    # --- win_to_nil ---
+    _goal_pattern("home_win_to_nil", "Home team win to nil", "win_to_nil",
+                  scores=_only_home_scores),
+    _goal_pattern("away_win_to_nil", "Away team win to nil", "win_to_nil",
+                  scores=_only_away_scores),
+
+    # --- team_total_goals ---
+    _goal_pattern("home_over_0_5", "Home team over 0.5 goals", "team_total_goals_home",
+                  compare=("home", ">", 0.5)),
+    _goal_pattern("home_over_1_5", "Home team over 1.5 goals", "team_total_goals_home",
+                  compare=("home", ">", 1.5)),
+    _goal_pattern("home_over_2_5", "Home team over 2.5 goals", "team_total_goals_home",
+                  compare=("home", ">", 2.5)),
+    _goal_pattern("away_over_0_5", "Away team over 0.5 goals", "team_total_goals_away",
+                  compare=("away", ">", 0.5)),
+    _goal_pattern("away_over_1_5", "Away team over 1.5 goals", "team_total_goals_away",
+                  compare=("away", ">", 1.5)),
+    _goal_pattern("away_over_2_5", "Away team over 2.5 goals", "team_total_goals_away",
+                  compare=("away", ">", 2.5)),
+
+    # --- goal_range ---
+    _goal_pattern("goal_range_0_1", "Goal range 0-1", "goal_range",
+                  compare=("total", "between", (0, 1))),
+    _goal_pattern("goal_range_2_3", "Goal range 2-3", "goal_range",
+                  compare=("total", "between", (2, 3))),
+    _goal_pattern("goal_range_4_6", "Goal range 4-6", "goal_range",
+                  compare=("total", "between", (4, 6))),
+    _goal_pattern("goal_range_7_plus", "Goal range 7+", "goal_range",
+                  compare=("total", ">=", 7)),
+
+    # --- teams_to_score ---
+    _goal_pattern("teams_to_score_none", "No team scores", "teams_to_score",
+                  scores=lambda s: (s.home == 0) & (s.away == 0)),
+    _goal_pattern("teams_to_score_only_home", "Only home team scores", "teams_to_score",
+                  scores=_only_home_scores),
+    _goal_pattern("teams_to_score_only_away", "Only away team scores", "teams_to_score",
+                  scores=_only_away_scores),
+    _goal_pattern("teams_to_score_both", "Both teams score", "teams_to_score",
+                  scores=_both_teams_score),
+
+    # --- odd_even ---
+    _goal_pattern("total_goals_odd", "Total goals odd", "odd_even",
+                  compare=("total", "parity", 1)),
+    _goal_pattern("total_goals_even", "Total goals even", "odd_even",
+                  compare=("total", "parity", 0)),
+    _goal_pattern("home_goals_odd", "Home team goals odd", "odd_even",
+                  compare=("home", "parity", 1)),
+    _goal_pattern("home_goals_even", "Home team goals even", "odd_even",
+                  compare=("home", "parity", 0)),
+    _goal_pattern("away_goals_odd", "Away team goals odd", "odd_even",
+                  compare=("away", "parity", 1)),
+    _goal_pattern("away_goals_even", "Away team goals even", "odd_even",
+                  compare=("away", "parity", 0)),
+
+    # --- exact_goals_home ---
+    _goal_pattern("home_goals_0", "Home team 0 goals", "exact_goals_home",
+                  compare=("home", "==", 0)),
+    _goal_pattern("home_goals_1", "Home team 1 goal", "exact_goals_home",
+                  compare=("home", "==", 1)),
+    _goal_pattern("home_goals_2", "Home team 2 goals", "exact_goals_home",
+                  compare=("home", "==", 2)),
+    _goal_pattern("home_goals_3_plus", "Home team 3+ goals", "exact_goals_home",
+                  compare=("home", ">=", 3)),
+
+    # --- exact_goals_away ---
+    _goal_pattern("away_goals_0", "Away team 0 goals", "exact_goals_away",
+                  compare=("away", "==", 0)),
+    _goal_pattern("away_goals_1", "Away team 1 goal", "exact_goals_away",
+                  compare=("away", "==", 1)),
+    _goal_pattern("away_goals_2", "Away team 2 goals", "exact_goals_away",
+                  compare=("away", "==", 2)),
+    _goal_pattern("away_goals_3_plus", "Away team 3+ goals", "exact_goals_away",
+                  compare=("away", ">=", 3)),
+
+    # --- winning_margin ---
+    _goal_pattern("win_margin_home_1", "Home win by 1 goal", "winning_margin",
+                  compare=("margin", "==", 1)),
+    _goal_pattern("win_margin_home_2", "Home win by 2 goals", "winning_margin",
+                  compare=("margin", "==", 2)),
+    _goal_pattern("win_margin_home_3_plus", "Home win by 3+ goals", "winning_margin",
+                  compare=("margin", ">=", 3)),
+    _goal_pattern("win_margin_away_1", "Away win by 1 goal", "winning_margin",
+                  compare=("margin", "==", -1)),
+    _goal_pattern("win_margin_away_2", "Away win by 2 goals", "winning_margin",
+                  compare=("margin", "==", -2)),
+    _goal_pattern("win_margin_away_3_plus", "Away win by 3+ goals", "winning_margin",
+                  compare=("margin", "<=", -3)),
+    _goal_pattern("win_margin_draw", "Draw", "winning_margin",
+                  compare=("margin", "==", 0)),
+
+    # --- score_both_halves ---
+    _goal_pattern("home_score_both_halves", "Home team scores in both halves", "score_both_halves",
+                  scores=lambda s: (s.first_home > 0) & (s.second_home > 0)),
+    _goal_pattern("away_score_both_halves", "Away team scores in both halves", "score_both_halves",
+                  scores=lambda s: (s.first_away > 0) & (s.second_away > 0)),
+
+    # --- win_either_half ---
+    _goal_pattern("home_win_either_half", "Home team wins either half", "win_either_half",
+                  scores=lambda s: (s.first_home > s.first_away) | (s.second_home > s.second_away)),
+    _goal_pattern("away_win_either_half", "Away team wins either half", "win_either_half",
+                  scores=lambda s: (s.first_away > s.first_home) | (s.second_away > s.second_home)),
+
+    # --- win_both_halves ---
+    _goal_pattern("home_win_both_halves", "Home team wins both halves", "win_both_halves",
+                  scores=lambda s: (s.first_home > s.first_away) & (s.second_home > s.second_away)),
+    _goal_pattern("away_win_both_halves", "Away team wins both halves", "win_both_halves",
+                  scores=lambda s: (s.first_away > s.first_home) & (s.second_away > s.second_home)),
+
+    # --- highest_scoring_half ---
+    _goal_pattern("highest_scoring_first", "First half highest scoring", "highest_scoring_half",
+                  scores=lambda s: s.first_home + s.first_away > s.second_home + s.second_away),
+    _goal_pattern("highest_scoring_second", "Second half highest scoring", "highest_scoring_half",
+                  scores=lambda s: s.second_home + s.second_away > s.first_home + s.first_away),
+    _goal_pattern("highest_scoring_equal", "Equal scoring halves", "highest_scoring_half",
+                  scores=lambda s: s.first_home + s.first_away == s.second_home + s.second_away),
+
+    # --- btts_both_halves ---
+    _goal_pattern("btts_both_halves_yes", "Both teams score in both halves", "btts_both_halves",
+                  scores=lambda s: (s.first_home > 0) & (s.first_away > 0) & (s.second_home > 0) & (s.second_away > 0)),
+    _goal_pattern("btts_both_halves_no", "Not both teams score in both halves", "btts_both_halves",
+                  negate_of="btts_both_halves_yes"),
+
+    # --- no_draw_btts ---
+    _goal_pattern("no_draw_btts_yes", "No draw & both teams score", "no_draw_btts",
+                  scores=lambda s: (s.home != s.away) & (s.home > 0) & (s.away > 0)),
+    _goal_pattern("no_draw_btts_no", "Draw or clean sheet", "no_draw_btts", negate_of="no_draw_btts_yes"),
+
+    # --- goal_bounds ---
+    _goal_pattern("goal_bounds_0", "Goal bounds: 0 goals", "goal_bounds",
+                  compare=("total", "==", 0)),
+    _goal_pattern("goal_bounds_0_1", "Goal bounds: 0-1 goals", "goal_bounds",
+                  compare=("total", "between", (0, 1))),
+    _goal_pattern("goal_bounds_0_2", "Goal bounds: 0-2 goals", "goal_bounds",
+                  compare=("total", "between", (0, 2))),
+    _goal_pattern("goal_bounds_1", "Goal bounds: 1 goal", "goal_bounds",
+                  compare=("total", "==", 1)),
+    _goal_pattern("goal_bounds_1_2", "Goal bounds: 1-2 goals", "goal_bounds",
+                  compare=("total", "between", (1, 2))),
+    _goal_pattern("goal_bounds_1_3", "Goal bounds: 1-3 goals", "goal_bounds",
+                  compare=("total", "between", (1, 3))),
+    _goal_pattern("goal_bounds_2", "Goal bounds: 2 goals", "goal_bounds",
+                  compare=("total", "==", 2)),
+    _goal_pattern("goal_bounds_2_3", "Goal bounds: 2-3 goals", "goal_bounds",
+                  compare=("total", "between", (2, 3))),
+    _goal_pattern("goal_bounds_3", "Goal bounds: 3 goals", "goal_bounds",
+                  compare=("total", "==", 3)),
+    _goal_pattern("goal_bounds_3_4", "Goal bounds: 3-4 goals", "goal_bounds",
+                  compare=("total", "between", (3, 4))),
+    _goal_pattern("goal_bounds_4", "Goal bounds: 4 goals", "goal_bounds",
+                  compare=("total", "==", 4)),
+    _goal_pattern("goal_bounds_4_5_plus", "Goal bounds: 4-5+ goals", "goal_bounds",
+                  compare=("total", ">=", 4)),
+    _goal_pattern("goal_bounds_5_plus", "Goal bounds: 5+ goals", "goal_bounds",
+                  compare=("total", ">=", 5)),
+
+    # --- excluded_goals ---
+    _goal_pattern("excluded_goals_0", "Excluded: 0 goals", "excluded_goals",
+                  compare=("total", "!=", 0)),
+    _goal_pattern("excluded_goals_1", "Excluded: 1 goal", "excluded_goals",
+                  compare=("total", "!=", 1)),
+    _goal_pattern("excluded_goals_2", "Excluded: 2 goals", "excluded_goals",
+                  compare=("total", "!=", 2)),
+    _goal_pattern("excluded_goals_3", "Excluded: 3 goals", "excluded_goals",
+                  compare=("total", "!=", 3)),
+    _goal_pattern("excluded_goals_4", "Excluded: 4 goals", "excluded_goals",
+                  compare=("total", "!=", 4)),
+    _goal_pattern("excluded_goals_5_plus", "Excluded: 5+ goals", "excluded_goals",
+                  compare=("total", "<", 5)),
+
+    # --- multigoals ---
+    _goal_pattern("multigoals_1_2", "Multigoals: 1-2 goals", "multigoals",
+                  compare=("total", "between", (1, 2))),
+    _goal_pattern("multigoals_1_3", "Multigoals: 1-3 goals", "multigoals",
+                  compare=("total", "between", (1, 3))),
+    _goal_pattern("multigoals_1_4", "Multigoals: 1-4 goals", "multigoals",
+                  compare=("total", "between", (1, 4))),
+    _goal_pattern("multigoals_2_3", "Multigoals: 2-3 goals", "multigoals",
+                  compare=("total", "between", (2, 3))),
+    _goal_pattern("multigoals_2_4", "Multigoals: 2-4 goals", "multigoals",
+                  compare=("total", "between", (2, 4))),
+    _goal_pattern("multigoals_3_4", "Multigoals: 3-4 goals", "multigoals",
+                  compare=("total", "between", (3, 4))),
+    _goal_pattern("multigoals_4_5", "Multigoals: 4-5 goals", "multigoals",
+                  compare=("total", "between", (4, 5))),
+    _goal_pattern("multigoals_5_6", "Multigoals: 5-6 goals", "multigoals",
+                  compare=("total", "between", (5, 6))),
+    _goal_pattern("multigoals_7_plus", "Multigoals: 7+ goals", "multigoals",
+                  compare=("total", ">=", 7)),
+    _goal_pattern("multigoals_no_goal", "Multigoals: No goal", "multigoals",
+                  compare=("total", "==", 0)),
+    #
+    # # =============================================================
+    # # --- MATCH RESULT MARKETS ---
+    # # =============================================================
+    #
+    # # --- 1x2 ---
+    # _pattern("home_win", "Home team wins", "1x2", EventType.TEAM_STATS,
+    #          lambda m: m.score_home > m.score_away),
+    # _pattern("draw", "Match ends in draw", "1x2", EventType.TEAM_STATS,
+    #          lambda m: m.score_home == m.score_away),
+    # _pattern("away_win", "Away team wins", "1x2", EventType.TEAM_STATS,
+    #          lambda m: m.score_away > m.score_home),
+    #
+    # # --- double_chance ---
+    # _pattern("home_or_draw", "Home win or draw", "double_chance", EventType.TEAM_STATS,
+    #          lambda m: m.score_home >= m.score_away),
+    # _pattern("home_or_away", "Home win or away win", "double_chance", EventType.TEAM_STATS,
+    #          lambda m: m.score_home != m.score_away),
+    # _pattern("draw_or_away", "Draw or away win", "double_chance", EventType.TEAM_STATS,
+    #          lambda m: m.score_home <= m.score_away),
+    #
+    # # --- draw_no_bet ---
+    # _pattern("home_win_dnb", "Home win (draw no bet)", "draw_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_home > m.score_away),
+    # _pattern("away_win_dnb", "Away win (draw no bet)", "draw_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_away > m.score_home),
+    #
+    # # --- halftime_fulltime ---
+    # _pattern("home_home", "Home/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "home_home"),
+    # _pattern("home_draw", "Home/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "home_draw"),
+    # _pattern("home_away", "Home/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "home_away"),
+    # _pattern("draw_home", "Draw/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_home"),
+    # _pattern("draw_draw", "Draw/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_draw"),
+    # _pattern("draw_away", "Draw/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_away"),
+    # _pattern("away_home", "Away/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "away_home"),
+    # _pattern("away_draw", "Away/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "away_draw"),
+    # _pattern("away_away", "Away/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
+    #          lambda m: EventPatterns._get_halftime_fulltime(m) == "away_away"),
+    #
+    # # --- home_no_bet ---
+    # _pattern("home_no_bet_draw", "Home no bet: Draw", "home_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_home == m.score_away),
+    # _pattern("home_no_bet_away", "Home no bet: Away", "home_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_away > m.score_home),
+    #
+    # # --- away_no_bet ---
+    # _pattern("away_no_bet_home", "Away no bet: Home", "away_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_home > m.score_away),
+    # _pattern("away_no_bet_draw", "Away no bet: Draw", "away_no_bet", EventType.TEAM_STATS,
+    #          lambda m: m.score_home == m.score_away),
+    #
+    # # =============================================================
+    # # --- HALF-TIME MARKETS ---
+    # # =============================================================
+    #
+    # # --- first_half_1x2 ---
+    # _pattern("first_half_home_win", "First half: Home win", "first_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) == "home"),
+    # _pattern("first_half_draw", "First half: Draw", "first_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) == "draw"),
+    # _pattern("first_half_away_win", "First half: Away win", "first_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) == "away"),
+    #
+    # # --- first_half_over_under ---
+    # _pattern("first_half_over_0_5", "First half goals over 0.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) > 0.5),
+    # _pattern("first_half_over_1_5", "First half goals over 1.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) > 1.5),
+    # _pattern("first_half_over_2_5", "First half goals over 2.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) > 2.5),
+    # _pattern("first_half_under_0_5", "First half goals under 0.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) < 0.5),
+    # _pattern("first_half_under_1_5", "First half goals under 1.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) < 1.5),
+    # _pattern("first_half_under_2_5", "First half goals under 2.5", "first_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_goals(m) < 2.5),
+    #
+    # # --- first_half_btts ---
+    # _pattern("first_half_btts_yes", "Both teams score in first half", "first_half_btts",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_btts(m)),
+    # _pattern("first_half_btts_no", "Not both teams score in first half", "first_half_btts",
+    #          EventType.HALF_STATS, negate_of="first_half_btts_yes"),
+    #
+    # # --- first_half_double_chance ---
+    # _pattern("first_half_home_or_draw", "First half: Home or draw", "first_half_double_chance",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) in ["home", "draw"]),
+    # _pattern("first_half_home_or_away", "First half: Home or away", "first_half_double_chance",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) in ["home", "away"]),
+    # _pattern("first_half_draw_or_away", "First half: Draw or away", "first_half_double_chance",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._first_half_result(m) in ["draw", "away"]),
+    #
+    # # --- second_half_1x2 ---
+    # _pattern("second_half_home_win", "Second half: Home win", "second_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_result(m) == "home"),
+    # _pattern("second_half_draw", "Second half: Draw", "second_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_result(m) == "draw"),
+    # _pattern("second_half_away_win", "Second half: Away win", "second_half_1x2", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_result(m) == "away"),
+    #
+    # # --- second_half_over_under ---
+    # _pattern("second_half_over_0_5", "Second half goals over 0.5", "second_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_goals(m) > 0.5),
+    # _pattern("second_half_over_1_5", "Second half goals over 1.5", "second_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_goals(m) > 1.5),
+    # _pattern("second_half_over_2_5", "Second half goals over 2.5", "second_half_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_goals(m) > 2.5),
+    #
+    # # --- second_half_btts ---
+    # _pattern("second_half_btts_yes", "Both teams score in second half", "second_half_btts",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._second_half_btts(m)),
+    # _pattern("second_half_btts_no", "Not both teams score in second half", "second_half_btts",
+    #          EventType.HALF_STATS, negate_of="second_half_btts_yes"),
+    #
+    # # --- both_halves_over_under ---
+    # _pattern("both_halves_over_1_5", "Both halves over 1.5 goals", "both_halves_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._both_halves_over_1_5(m)),
+    # _pattern("both_halves_under_1_5", "Both halves under 1.5 goals", "both_halves_over_under",
+    #          EventType.HALF_STATS,
+    #          lambda m: EventPatterns._both_halves_under_1_5(m)),
+    #
+    # # --- 1st_2nd_half_gg_ng ---
+    # _pattern("half_gg_ng_no_no", "Half GG/NG: No/No", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._half_gg_ng(m) == "no_no"),
+    # _pattern("half_gg_ng_yes_no", "Half GG/NG: Yes/No", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._half_gg_ng(m) == "yes_no"),
+    # _pattern("half_gg_ng_yes_yes", "Half GG/NG: Yes/Yes", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._half_gg_ng(m) == "yes_yes"),
+    # _pattern("half_gg_ng_no_yes", "Half GG/NG: No/Yes", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
+    #          lambda m: EventPatterns._half_gg_ng(m) == "no_yes"),
+    #
+    # # =============================================================
+    # # --- CARDS MARKETS ---
+    # # =============================================================
+    #
+    # # --- total_cards_over_under ---
+    # _pattern("over_0_5_cards", "Total cards over 0.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 0.5),
+    # _pattern("over_1_5_cards", "Total cards over 1.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 1.5),
+    # _pattern("over_2_5_cards", "Total cards over 2.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 2.5),
+    # _pattern("over_3_5_cards", "Total cards over 3.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 3.5),
+    # _pattern("over_4_5_cards", "Total cards over 4.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 4.5),
+    # _pattern("over_5_5_cards", "Total cards over 5.5", "total_cards_over_under", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) > 5.5),
+    #
+    # # --- team_cards_over_under ---
+    # _pattern("home_over_0_5_cards", "Home team cards over 0.5", "team_cards_home", EventType.CARDS,
+    #          lambda m: EventPatterns._home_cards(m) > 0.5),
+    # _pattern("home_over_1_5_cards", "Home team cards over 1.5", "team_cards_home", EventType.CARDS,
+    #          lambda m: EventPatterns._home_cards(m) > 1.5),
+    # _pattern("home_over_2_5_cards", "Home team cards over 2.5", "team_cards_home", EventType.CARDS,
+    #          lambda m: EventPatterns._home_cards(m) > 2.5),
+    # _pattern("away_over_0_5_cards", "Away team cards over 0.5", "team_cards_away", EventType.CARDS,
+    #          lambda m: EventPatterns._away_cards(m) > 0.5),
+    # _pattern("away_over_1_5_cards", "Away team cards over 1.5", "team_cards_away", EventType.CARDS,
+    #          lambda m: EventPatterns._away_cards(m) > 1.5),
+    # _pattern("away_over_2_5_cards", "Away team cards over 2.5", "team_cards_away", EventType.CARDS,
+    #          lambda m: EventPatterns._away_cards(m) > 2.5),
+    #
+    # # --- first_half_cards_over_under ---
+    # _pattern("first_half_over_0_5_cards", "First half cards over 0.5", "first_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._first_half_cards(m) > 0.5),
+    # _pattern("first_half_over_1_5_cards", "First half cards over 1.5", "first_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._first_half_cards(m) > 1.5),
+    # _pattern("first_half_over_2_5_cards", "First half cards over 2.5", "first_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._first_half_cards(m) > 2.5),
+    #
+    # # --- second_half_cards_over_under ---
+    # _pattern("second_half_over_1_5_cards", "Second half cards over 1.5", "second_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._second_half_cards(m) > 1.5),
+    # _pattern("second_half_over_2_5_cards", "Second half cards over 2.5", "second_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._second_half_cards(m) > 2.5),
+    # _pattern("second_half_over_3_5_cards", "Second half cards over 3.5", "second_half_cards",
+    #          EventType.CARDS,
+    #          lambda m: EventPatterns._second_half_cards(m) > 3.5),
+    #
+    # # --- match_cards ---
+    # _pattern("match_cards_4_plus", "Match cards 4+", "match_cards", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) >= 4),
+    # _pattern("match_cards_5_plus", "Match cards 5+", "match_cards", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) >= 5),
+    # _pattern("match_cards_6_plus", "Match cards 6+", "match_cards", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) >= 6),
+    # _pattern("match_cards_7_plus", "Match cards 7+", "match_cards", EventType.CARDS,
+    #          lambda m: EventPatterns._total_cards(m) >= 7),
+    #
+    # # =============================================================
+    # # --- CORNERS MARKETS ---
+    # # =============================================================
+    #
+    # # --- total_corners_over_under ---
+    # _pattern("over_8_5_corners", "Total corners over 8.5", "total_corners_over_under", EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) > 8.5),
+    # _pattern("over_9_5_corners", "Total corners over 9.5", "total_corners_over_under", EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) > 9.5),
+    # _pattern("over_10_5_corners", "Total corners over 10.5", "total_corners_over_under",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) > 10.5),
+    #
+    # # --- team_corners_over_under ---
+    # _pattern("home_over_4_5_corners", "Home team corners over 4.5", "team_corners_home",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._home_corners(m) > 4.5),
+    # _pattern("home_over_5_5_corners", "Home team corners over 5.5", "team_corners_home",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._home_corners(m) > 5.5),
+    # _pattern("away_over_1_5_corners", "Away team corners over 1.5", "team_corners_away",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._away_corners(m) > 1.5),
+    # _pattern("away_over_2_5_corners", "Away team corners over 2.5", "team_corners_away",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._away_corners(m) > 2.5),
+    #
+    # # --- first_half_corners_over_under ---
+    # _pattern("first_half_over_3_5_corners", "First half corners over 3.5", "first_half_corners",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._first_half_corners(m) > 3.5),
+    # _pattern("first_half_over_4_5_corners", "First half corners over 4.5", "first_half_corners",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._first_half_corners(m) > 4.5),
+    # _pattern("first_half_over_5_5_corners", "First half corners over 5.5", "first_half_corners",
+    #          EventType.CORNERS,
+    #          lambda m: EventPatterns._first_half_corners(m) > 5.5),
+    #
+    # # --- corner_range ---
+    # _pattern("corner_range_0_8", "Corner range 0-8", "corner_range", EventType.CORNERS,
+    #          lambda m: 0 <= EventPatterns._total_corners(m) <= 8),
+    # _pattern("corner_range_9_11", "Corner range 9-11", "corner_range", EventType.CORNERS,
+    #          lambda m: 9 <= EventPatterns._total_corners(m) <= 11),
+    # _pattern("corner_range_12_plus", "Corner range 12+", "corner_range", EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) >= 12),
+    #
+    # # --- odd_even_corners ---
+    # _pattern("corners_odd", "Total corners odd", "odd_even_corners", EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) % 2 == 1),
+    # _pattern("corners_even", "Total corners even", "odd_even_corners", EventType.CORNERS,
+    #          lambda m: EventPatterns._total_corners(m) % 2 == 0),
+
+    # Add more patterns as needed...
+)
+
+# Position of every pattern in _ALL_PATTERNS, for lookups by name
+PATTERN_INDEX: Dict[str, int] = {pattern.name: index for index, pattern in enumerate(_ALL_PATTERNS)}
+
+# The same patterns split by the data they read, each part in declaration order
+_FULL_TIME_PATTERNS: Tuple[EventCondition, ...] = tuple(p for p in _ALL_PATTERNS if not p.needs_halves)
+_HALF_TIME_PATTERNS: Tuple[EventCondition, ...] = tuple(p for p in _ALL_PATTERNS if p.needs_halves)
 
 
 class EventPatterns:
     """Define various event patterns (markets) to analyze"""
 
+    # Patterns grouped by market, each group in declaration order
+    BY_MARKET: Dict[str, Tuple[EventCondition, ...]] = {
+        market: tuple(pattern for pattern in _ALL_PATTERNS if pattern.market is market)
+        for market in dict.fromkeys(pattern.market for pattern in _ALL_PATTERNS)
+    }
+
+    @staticmethod
+    def get_all_patterns(include_halves: bool = True) -> Tuple[EventCondition, ...]:
+        """Every pattern, built once at import and shared read-only by all callers"""
+        return _ALL_PATTERNS if include_halves else _FULL_TIME_PATTERNS
+
     @staticmethod
-    def get_all_patterns() -> List[EventCondition]:
-        return [
-            # =============================================================
-            # --- GOALS MARKETS ---
-            # =============================================================
-
-            # --- total_goals_exact ---
-            EventCondition("total_goals_0", "Total goals = 0", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 0),
-            EventCondition("total_goals_1", "Total goals = 1", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 1),
-            EventCondition("total_goals_2", "Total goals = 2", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 2),
-            EventCondition("total_goals_3", "Total goals = 3", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 3),
-            EventCondition("total_goals_4", "Total goals = 4", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 4),
-            EventCondition("total_goals_5_plus", "Total goals ≥ 5", "total_goals_exact", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) >= 5),
-
-            # --- total_goals_over_under ---
-            EventCondition("over_0_5_goals", "Total goals over 0.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 0.5),
-            EventCondition("over_1_5_goals", "Total goals over 1.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 1.5),
-            EventCondition("over_2_5_goals", "Total goals over 2.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 2.5),
-            EventCondition("over_3_5_goals", "Total goals over 3.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 3.5),
-            EventCondition("over_4_5_goals", "Total goals over 4.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 4.5),
-            EventCondition("over_5_5_goals", "Total goals over 5.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) > 5.5),
-            EventCondition("under_0_5_goals", "Total goals under 0.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 0.5),
-            EventCondition("under_1_5_goals", "Total goals under 1.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 1.5),
-            EventCondition("under_2_5_goals", "Total goals under 2.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 2.5),
-            EventCondition("under_3_5_goals", "Total goals under 3.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 3.5),
-            EventCondition("under_4_5_goals", "Total goals under 4.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 4.5),
-            EventCondition("under_5_5_goals", "Total goals under 5.5", "total_goals_over_under", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 5.5),
-
-            # --- btts ---
-            EventCondition("btts_yes", "Both teams to score (Yes)", "btts", EventType.GOALS,
-                           lambda m: m.score_home > 0 and m.score_away > 0),
-            EventCondition("btts_no", "Both teams to score (No)", "btts", EventType.GOALS,
-                           lambda m: m.score_home == 0 or m.score_away == 0),
-
-            # --- clean_sheet ---
-            EventCondition("clean_sheet_home", "Home team clean sheet", "clean_sheet", EventType.GOALS,
-                           lambda m: m.score_away == 0),
-            EventCondition("clean_sheet_away", "Away team clean sheet", "clean_sheet", EventType.GOALS,
-                           lambda m: m.score_home == 0),
-
-            # --- win_to_nil ---
-            EventCondition("home_win_to_nil", "Home team win to nil", "win_to_nil", EventType.GOALS,
-                           lambda m: m.score_home > 0 and m.score_away == 0),
-            EventCondition("away_win_to_nil", "Away team win to nil", "win_to_nil", EventType.GOALS,
-                           lambda m: m.score_away > 0 and m.score_home == 0),
-
-            # --- team_total_goals ---
-            EventCondition("home_over_0_5", "Home team over 0.5 goals", "team_total_goals_home", EventType.GOALS,
-                           lambda m: m.score_home > 0.5),
-            EventCondition("home_over_1_5", "Home team over 1.5 goals", "team_total_goals_home", EventType.GOALS,
-                           lambda m: m.score_home > 1.5),
-            EventCondition("home_over_2_5", "Home team over 2.5 goals", "team_total_goals_home", EventType.GOALS,
-                           lambda m: m.score_home > 2.5),
-            EventCondition("away_over_0_5", "Away team over 0.5 goals", "team_total_goals_away", EventType.GOALS,
-                           lambda m: m.score_away > 0.5),
-            EventCondition("away_over_1_5", "Away team over 1.5 goals", "team_total_goals_away", EventType.GOALS,
-                           lambda m: m.score_away > 1.5),
-            EventCondition("away_over_2_5", "Away team over 2.5 goals", "team_total_goals_away", EventType.GOALS,
-                           lambda m: m.score_away > 2.5),
-
-            # --- goal_range ---
-            EventCondition("goal_range_0_1", "Goal range 0-1", "goal_range", EventType.GOALS,
-                           lambda m: 0 <= (m.score_home + m.score_away) <= 1),
-            EventCondition("goal_range_2_3", "Goal range 2-3", "goal_range", EventType.GOALS,
-                           lambda m: 2 <= (m.score_home + m.score_away) <= 3),
-            EventCondition("goal_range_4_6", "Goal range 4-6", "goal_range", EventType.GOALS,
-                           lambda m: 4 <= (m.score_home + m.score_away) <= 6),
-            EventCondition("goal_range_7_plus", "Goal range 7+", "goal_range", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) >= 7),
-
-            # --- teams_to_score ---
-            EventCondition("teams_to_score_none", "No team scores", "teams_to_score", EventType.GOALS,
-                           lambda m: m.score_home == 0 and m.score_away == 0),
-            EventCondition("teams_to_score_only_home", "Only home team scores", "teams_to_score", EventType.GOALS,
-                           lambda m: m.score_home > 0 and m.score_away == 0),
-            EventCondition("teams_to_score_only_away", "Only away team scores", "teams_to_score", EventType.GOALS,
-                           lambda m: m.score_away > 0 and m.score_home == 0),
-            EventCondition("teams_to_score_both", "Both teams score", "teams_to_score", EventType.GOALS,
-                           lambda m: m.score_home > 0 and m.score_away > 0),
-
-            # --- odd_even ---
-            EventCondition("total_goals_odd", "Total goals odd", "odd_even", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) % 2 == 1),
-            EventCondition("total_goals_even", "Total goals even", "odd_even", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) % 2 == 0),
-            EventCondition("home_goals_odd", "Home team goals odd", "odd_even", EventType.GOALS,
-                           lambda m: m.score_home % 2 == 1),
-            EventCondition("home_goals_even", "Home team goals even", "odd_even", EventType.GOALS,
-                           lambda m: m.score_home % 2 == 0),
-            EventCondition("away_goals_odd", "Away team goals odd", "odd_even", EventType.GOALS,
-                           lambda m: m.score_away % 2 == 1),
-            EventCondition("away_goals_even", "Away team goals even", "odd_even", EventType.GOALS,
-                           lambda m: m.score_away % 2 == 0),
-
-            # --- exact_goals_home ---
-            EventCondition("home_goals_0", "Home team 0 goals", "exact_goals_home", EventType.GOALS,
-                           lambda m: m.score_home == 0),
-            EventCondition("home_goals_1", "Home team 1 goal", "exact_goals_home", EventType.GOALS,
-                           lambda m: m.score_home == 1),
-            EventCondition("home_goals_2", "Home team 2 goals", "exact_goals_home", EventType.GOALS,
-                           lambda m: m.score_home == 2),
-            EventCondition("home_goals_3_plus", "Home team 3+ goals", "exact_goals_home", EventType.GOALS,
-                           lambda m: m.score_home >= 3),
-
-            # --- exact_goals_away ---
-            EventCondition("away_goals_0", "Away team 0 goals", "exact_goals_away", EventType.GOALS,
-                           lambda m: m.score_away == 0),
-            EventCondition("away_goals_1", "Away team 1 goal", "exact_goals_away", EventType.GOALS,
-                           lambda m: m.score_away == 1),
-            EventCondition("away_goals_2", "Away team 2 goals", "exact_goals_away", EventType.GOALS,
-                           lambda m: m.score_away == 2),
-            EventCondition("away_goals_3_plus", "Away team 3+ goals", "exact_goals_away", EventType.GOALS,
-                           lambda m: m.score_away >= 3),
-
-            # --- winning_margin ---
-            EventCondition("win_margin_home_1", "Home win by 1 goal", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_home - m.score_away == 1),
-            EventCondition("win_margin_home_2", "Home win by 2 goals", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_home - m.score_away == 2),
-            EventCondition("win_margin_home_3_plus", "Home win by 3+ goals", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_home - m.score_away >= 3),
-            EventCondition("win_margin_away_1", "Away win by 1 goal", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_away - m.score_home == 1),
-            EventCondition("win_margin_away_2", "Away win by 2 goals", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_away - m.score_home == 2),
-            EventCondition("win_margin_away_3_plus", "Away win by 3+ goals", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_away - m.score_home >= 3),
-            EventCondition("win_margin_draw", "Draw", "winning_margin", EventType.GOALS,
-                           lambda m: m.score_home == m.score_away),
-
-            # --- score_both_halves ---
-            EventCondition("home_score_both_halves", "Home team scores in both halves", "score_both_halves",
-                           EventType.GOALS,
-                           lambda m: EventPatterns._has_home_score_both_halves(m)),
-            EventCondition("away_score_both_halves", "Away team scores in both halves", "score_both_halves",
-                           EventType.GOALS,
-                           lambda m: EventPatterns._has_away_score_both_halves(m)),
-
-            # --- win_either_half ---
-            EventCondition("home_win_either_half", "Home team wins either half", "win_either_half", EventType.GOALS,
-                           lambda m: EventPatterns._home_won_either_half(m)),
-            EventCondition("away_win_either_half", "Away team wins either half", "win_either_half", EventType.GOALS,
-                           lambda m: EventPatterns._away_won_either_half(m)),
-
-            # --- win_both_halves ---
-            EventCondition("home_win_both_halves", "Home team wins both halves", "win_both_halves", EventType.GOALS,
-                           lambda m: EventPatterns._home_won_both_halves(m)),
-            EventCondition("away_win_both_halves", "Away team wins both halves", "win_both_halves", EventType.GOALS,
-                           lambda m: EventPatterns._away_won_both_halves(m)),
-
-            # --- highest_scoring_half ---
-            EventCondition("highest_scoring_first", "First half highest scoring", "highest_scoring_half",
-                           EventType.GOALS,
-                           lambda m: EventPatterns._highest_scoring_half(m) == "first"),
-            EventCondition("highest_scoring_second", "Second half highest scoring", "highest_scoring_half",
-                           EventType.GOALS,
-                           lambda m: EventPatterns._highest_scoring_half(m) == "second"),
-            EventCondition("highest_scoring_equal", "Equal scoring halves", "highest_scoring_half", EventType.GOALS,
-                           lambda m: EventPatterns._highest_scoring_half(m) == "equal"),
-
-            # --- btts_both_halves ---
-            EventCondition("btts_both_halves_yes", "Both teams score in both halves", "btts_both_halves",
-                           EventType.GOALS,
-                           lambda m: EventPatterns._btts_both_halves(m)),
-            EventCondition("btts_both_halves_no", "Not both teams score in both halves", "btts_both_halves",
-                           EventType.GOALS,
-                           lambda m: not EventPatterns._btts_both_halves(m)),
-
-            # --- no_draw_btts ---
-            EventCondition("no_draw_btts_yes", "No draw & both teams score", "no_draw_btts", EventType.GOALS,
-                           lambda m: m.score_home != m.score_away and m.score_home > 0 and m.score_away > 0),
-            EventCondition("no_draw_btts_no", "Draw or clean sheet", "no_draw_btts", EventType.GOALS,
-                           lambda m: m.score_home == m.score_away or m.score_home == 0 or m.score_away == 0),
-
-            # --- goal_bounds ---
-            EventCondition("goal_bounds_0", "Goal bounds: 0 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 0),
-            EventCondition("goal_bounds_0_1", "Goal bounds: 0-1 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 0 <= (m.score_home + m.score_away) <= 1),
-            EventCondition("goal_bounds_0_2", "Goal bounds: 0-2 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 0 <= (m.score_home + m.score_away) <= 2),
-            EventCondition("goal_bounds_1", "Goal bounds: 1 goal", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 1),
-            EventCondition("goal_bounds_1_2", "Goal bounds: 1-2 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 1 <= (m.score_home + m.score_away) <= 2),
-            EventCondition("goal_bounds_1_3", "Goal bounds: 1-3 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 1 <= (m.score_home + m.score_away) <= 3),
-            EventCondition("goal_bounds_2", "Goal bounds: 2 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 2),
-            EventCondition("goal_bounds_2_3", "Goal bounds: 2-3 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 2 <= (m.score_home + m.score_away) <= 3),
-            EventCondition("goal_bounds_3", "Goal bounds: 3 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 3),
-            EventCondition("goal_bounds_3_4", "Goal bounds: 3-4 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: 3 <= (m.score_home + m.score_away) <= 4),
-            EventCondition("goal_bounds_4", "Goal bounds: 4 goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 4),
-            EventCondition("goal_bounds_4_5_plus", "Goal bounds: 4-5+ goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) >= 4),
-            EventCondition("goal_bounds_5_plus", "Goal bounds: 5+ goals", "goal_bounds", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) >= 5),
-
-            # --- excluded_goals ---
-            EventCondition("excluded_goals_0", "Excluded: 0 goals", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) != 0),
-            EventCondition("excluded_goals_1", "Excluded: 1 goal", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) != 1),
-            EventCondition("excluded_goals_2", "Excluded: 2 goals", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) != 2),
-            EventCondition("excluded_goals_3", "Excluded: 3 goals", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) != 3),
-            EventCondition("excluded_goals_4", "Excluded: 4 goals", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) != 4),
-            EventCondition("excluded_goals_5_plus", "Excluded: 5+ goals", "excluded_goals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) < 5),
-
-            # --- multigoals ---
-            EventCondition("multigoals_1_2", "Multigoals: 1-2 goals", "multigoals", EventType.GOALS,
-                           lambda m: 1 <= (m.score_home + m.score_away) <= 2),
-            EventCondition("multigoals_1_3", "Multigoals: 1-3 goals", "multigoals", EventType.GOALS,
-                           lambda m: 1 <= (m.score_home + m.score_away) <= 3),
-            EventCondition("multigoals_1_4", "Multigoals: 1-4 goals", "multigoals", EventType.GOALS,
-                           lambda m: 1 <= (m.score_home + m.score_away) <= 4),
-            EventCondition("multigoals_2_3", "Multigoals: 2-3 goals", "multigoals", EventType.GOALS,
-                           lambda m: 2 <= (m.score_home + m.score_away) <= 3),
-            EventCondition("multigoals_2_4", "Multigoals: 2-4 goals", "multigoals", EventType.GOALS,
-                           lambda m: 2 <= (m.score_home + m.score_away) <= 4),
-            EventCondition("multigoals_3_4", "Multigoals: 3-4 goals", "multigoals", EventType.GOALS,
-                           lambda m: 3 <= (m.score_home + m.score_away) <= 4),
-            EventCondition("multigoals_4_5", "Multigoals: 4-5 goals", "multigoals", EventType.GOALS,
-                           lambda m: 4 <= (m.score_home + m.score_away) <= 5),
-            EventCondition("multigoals_5_6", "Multigoals: 5-6 goals", "multigoals", EventType.GOALS,
-                           lambda m: 5 <= (m.score_home + m.score_away) <= 6),
-            EventCondition("multigoals_7_plus", "Multigoals: 7+ goals", "multigoals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) >= 7),
-            EventCondition("multigoals_no_goal", "Multigoals: No goal", "multigoals", EventType.GOALS,
-                           lambda m: (m.score_home + m.score_away) == 0),
-            #
-            # # =============================================================
-            # # --- MATCH RESULT MARKETS ---
-            # # =============================================================
-            #
-            # # --- 1x2 ---
-            # EventCondition("home_win", "Home team wins", "1x2", EventType.TEAM_STATS,
-            #                lambda m: m.score_home > m.score_away),
-            # EventCondition("draw", "Match ends in draw", "1x2", EventType.TEAM_STATS,
-            #                lambda m: m.score_home == m.score_away),
-            # EventCondition("away_win", "Away team wins", "1x2", EventType.TEAM_STATS,
-            #                lambda m: m.score_away > m.score_home),
-            #
-            # # --- double_chance ---
-            # EventCondition("home_or_draw", "Home win or draw", "double_chance", EventType.TEAM_STATS,
-            #                lambda m: m.score_home >= m.score_away),
-            # EventCondition("home_or_away", "Home win or away win", "double_chance", EventType.TEAM_STATS,
-            #                lambda m: m.score_home != m.score_away),
-            # EventCondition("draw_or_away", "Draw or away win", "double_chance", EventType.TEAM_STATS,
-            #                lambda m: m.score_home <= m.score_away),
-            #
-            # # --- draw_no_bet ---
-            # EventCondition("home_win_dnb", "Home win (draw no bet)", "draw_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_home > m.score_away),
-            # EventCondition("away_win_dnb", "Away win (draw no bet)", "draw_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_away > m.score_home),
-            #
-            # # --- halftime_fulltime ---
-            # EventCondition("home_home", "Home/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "home_home"),
-            # EventCondition("home_draw", "Home/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "home_draw"),
-            # EventCondition("home_away", "Home/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "home_away"),
-            # EventCondition("draw_home", "Draw/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_home"),
-            # EventCondition("draw_draw", "Draw/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_draw"),
-            # EventCondition("draw_away", "Draw/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "draw_away"),
-            # EventCondition("away_home", "Away/Home (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "away_home"),
-            # EventCondition("away_draw", "Away/Draw (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "away_draw"),
-            # EventCondition("away_away", "Away/Away (HT/FT)", "halftime_fulltime", EventType.TEAM_STATS,
-            #                lambda m: EventPatterns._get_halftime_fulltime(m) == "away_away"),
-            #
-            # # --- home_no_bet ---
-            # EventCondition("home_no_bet_draw", "Home no bet: Draw", "home_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_home == m.score_away),
-            # EventCondition("home_no_bet_away", "Home no bet: Away", "home_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_away > m.score_home),
-            #
-            # # --- away_no_bet ---
-            # EventCondition("away_no_bet_home", "Away no bet: Home", "away_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_home > m.score_away),
-            # EventCondition("away_no_bet_draw", "Away no bet: Draw", "away_no_bet", EventType.TEAM_STATS,
-            #                lambda m: m.score_home == m.score_away),
-            #
-            # # =============================================================
-            # # --- HALF-TIME MARKETS ---
-            # # =============================================================
-            #
-            # # --- first_half_1x2 ---
-            # EventCondition("first_half_home_win", "First half: Home win", "first_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) == "home"),
-            # EventCondition("first_half_draw", "First half: Draw", "first_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) == "draw"),
-            # EventCondition("first_half_away_win", "First half: Away win", "first_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) == "away"),
-            #
-            # # --- first_half_over_under ---
-            # EventCondition("first_half_over_0_5", "First half goals over 0.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) > 0.5),
-            # EventCondition("first_half_over_1_5", "First half goals over 1.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) > 1.5),
-            # EventCondition("first_half_over_2_5", "First half goals over 2.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) > 2.5),
-            # EventCondition("first_half_under_0_5", "First half goals under 0.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) < 0.5),
-            # EventCondition("first_half_under_1_5", "First half goals under 1.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) < 1.5),
-            # EventCondition("first_half_under_2_5", "First half goals under 2.5", "first_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_goals(m) < 2.5),
-            #
-            # # --- first_half_btts ---
-            # EventCondition("first_half_btts_yes", "Both teams score in first half", "first_half_btts",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_btts(m)),
-            # EventCondition("first_half_btts_no", "Not both teams score in first half", "first_half_btts",
-            #                EventType.HALF_STATS,
-            #                lambda m: not EventPatterns._first_half_btts(m)),
-            #
-            # # --- first_half_double_chance ---
-            # EventCondition("first_half_home_or_draw", "First half: Home or draw", "first_half_double_chance",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) in ["home", "draw"]),
-            # EventCondition("first_half_home_or_away", "First half: Home or away", "first_half_double_chance",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) in ["home", "away"]),
-            # EventCondition("first_half_draw_or_away", "First half: Draw or away", "first_half_double_chance",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._first_half_result(m) in ["draw", "away"]),
-            #
-            # # --- second_half_1x2 ---
-            # EventCondition("second_half_home_win", "Second half: Home win", "second_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_result(m) == "home"),
-            # EventCondition("second_half_draw", "Second half: Draw", "second_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_result(m) == "draw"),
-            # EventCondition("second_half_away_win", "Second half: Away win", "second_half_1x2", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_result(m) == "away"),
-            #
-            # # --- second_half_over_under ---
-            # EventCondition("second_half_over_0_5", "Second half goals over 0.5", "second_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_goals(m) > 0.5),
-            # EventCondition("second_half_over_1_5", "Second half goals over 1.5", "second_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_goals(m) > 1.5),
-            # EventCondition("second_half_over_2_5", "Second half goals over 2.5", "second_half_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_goals(m) > 2.5),
-            #
-            # # --- second_half_btts ---
-            # EventCondition("second_half_btts_yes", "Both teams score in second half", "second_half_btts",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._second_half_btts(m)),
-            # EventCondition("second_half_btts_no", "Not both teams score in second half", "second_half_btts",
-            #                EventType.HALF_STATS,
-            #                lambda m: not EventPatterns._second_half_btts(m)),
-            #
-            # # --- both_halves_over_under ---
-            # EventCondition("both_halves_over_1_5", "Both halves over 1.5 goals", "both_halves_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._both_halves_over_1_5(m)),
-            # EventCondition("both_halves_under_1_5", "Both halves under 1.5 goals", "both_halves_over_under",
-            #                EventType.HALF_STATS,
-            #                lambda m: EventPatterns._both_halves_under_1_5(m)),
-            #
-            # # --- 1st_2nd_half_gg_ng ---
-            # EventCondition("half_gg_ng_no_no", "Half GG/NG: No/No", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._half_gg_ng(m) == "no_no"),
-            # EventCondition("half_gg_ng_yes_no", "Half GG/NG: Yes/No", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._half_gg_ng(m) == "yes_no"),
-            # EventCondition("half_gg_ng_yes_yes", "Half GG/NG: Yes/Yes", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._half_gg_ng(m) == "yes_yes"),
-            # EventCondition("half_gg_ng_no_yes", "Half GG/NG: No/Yes", "1st_2nd_half_gg_ng", EventType.HALF_STATS,
-            #                lambda m: EventPatterns._half_gg_ng(m) == "no_yes"),
-            #
-            # # =============================================================
-            # # --- CARDS MARKETS ---
-            # # =============================================================
-            #
-            # # --- total_cards_over_under ---
-            # EventCondition("over_0_5_cards", "Total cards over 0.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 0.5),
-            # EventCondition("over_1_5_cards", "Total cards over 1.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 1.5),
-            # EventCondition("over_2_5_cards", "Total cards over 2.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 2.5),
-            # EventCondition("over_3_5_cards", "Total cards over 3.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 3.5),
-            # EventCondition("over_4_5_cards", "Total cards over 4.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 4.5),
-            # EventCondition("over_5_5_cards", "Total cards over 5.5", "total_cards_over_under", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) > 5.5),
-            #
-            # # --- team_cards_over_under ---
-            # EventCondition("home_over_0_5_cards", "Home team cards over 0.5", "team_cards_home", EventType.CARDS,
-            #                lambda m: EventPatterns._home_cards(m) > 0.5),
-            # EventCondition("home_over_1_5_cards", "Home team cards over 1.5", "team_cards_home", EventType.CARDS,
-            #                lambda m: EventPatterns._home_cards(m) > 1.5),
-            # EventCondition("home_over_2_5_cards", "Home team cards over 2.5", "team_cards_home", EventType.CARDS,
-            #                lambda m: EventPatterns._home_cards(m) > 2.5),
-            # EventCondition("away_over_0_5_cards", "Away team cards over 0.5", "team_cards_away", EventType.CARDS,
-            #                lambda m: EventPatterns._away_cards(m) > 0.5),
-            # EventCondition("away_over_1_5_cards", "Away team cards over 1.5", "team_cards_away", EventType.CARDS,
-            #                lambda m: EventPatterns._away_cards(m) > 1.5),
-            # EventCondition("away_over_2_5_cards", "Away team cards over 2.5", "team_cards_away", EventType.CARDS,
-            #                lambda m: EventPatterns._away_cards(m) > 2.5),
-            #
-            # # --- first_half_cards_over_under ---
-            # EventCondition("first_half_over_0_5_cards", "First half cards over 0.5", "first_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._first_half_cards(m) > 0.5),
-            # EventCondition("first_half_over_1_5_cards", "First half cards over 1.5", "first_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._first_half_cards(m) > 1.5),
-            # EventCondition("first_half_over_2_5_cards", "First half cards over 2.5", "first_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._first_half_cards(m) > 2.5),
-            #
-            # # --- second_half_cards_over_under ---
-            # EventCondition("second_half_over_1_5_cards", "Second half cards over 1.5", "second_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._second_half_cards(m) > 1.5),
-            # EventCondition("second_half_over_2_5_cards", "Second half cards over 2.5", "second_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._second_half_cards(m) > 2.5),
-            # EventCondition("second_half_over_3_5_cards", "Second half cards over 3.5", "second_half_cards",
-            #                EventType.CARDS,
-            #                lambda m: EventPatterns._second_half_cards(m) > 3.5),
-            #
-            # # --- match_cards ---
-            # EventCondition("match_cards_4_plus", "Match cards 4+", "match_cards", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) >= 4),
-            # EventCondition("match_cards_5_plus", "Match cards 5+", "match_cards", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) >= 5),
-            # EventCondition("match_cards_6_plus", "Match cards 6+", "match_cards", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) >= 6),
-            # EventCondition("match_cards_7_plus", "Match cards 7+", "match_cards", EventType.CARDS,
-            #                lambda m: EventPatterns._total_cards(m) >= 7),
-            #
-            # # =============================================================
-            # # --- CORNERS MARKETS ---
-            # # =============================================================
-            #
-            # # --- total_corners_over_under ---
-            # EventCondition("over_8_5_corners", "Total corners over 8.5", "total_corners_over_under", EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) > 8.5),
-            # EventCondition("over_9_5_corners", "Total corners over 9.5", "total_corners_over_under", EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) > 9.5),
-            # EventCondition("over_10_5_corners", "Total corners over 10.5", "total_corners_over_under",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) > 10.5),
-            #
-            # # --- team_corners_over_under ---
-            # EventCondition("home_over_4_5_corners", "Home team corners over 4.5", "team_corners_home",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._home_corners(m) > 4.5),
-            # EventCondition("home_over_5_5_corners", "Home team corners over 5.5", "team_corners_home",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._home_corners(m) > 5.5),
-            # EventCondition("away_over_1_5_corners", "Away team corners over 1.5", "team_corners_away",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._away_corners(m) > 1.5),
-            # EventCondition("away_over_2_5_corners", "Away team corners over 2.5", "team_corners_away",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._away_corners(m) > 2.5),
-            #
-            # # --- first_half_corners_over_under ---
-            # EventCondition("first_half_over_3_5_corners", "First half corners over 3.5", "first_half_corners",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._first_half_corners(m) > 3.5),
-            # EventCondition("first_half_over_4_5_corners", "First half corners over 4.5", "first_half_corners",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._first_half_corners(m) > 4.5),
-            # EventCondition("first_half_over_5_5_corners", "First half corners over 5.5", "first_half_corners",
-            #                EventType.CORNERS,
-            #                lambda m: EventPatterns._first_half_corners(m) > 5.5),
-            #
-            # # --- corner_range ---
-            # EventCondition("corner_range_0_8", "Corner range 0-8", "corner_range", EventType.CORNERS,
-            #                lambda m: 0 <= EventPatterns._total_corners(m) <= 8),
-            # EventCondition("corner_range_9_11", "Corner range 9-11", "corner_range", EventType.CORNERS,
-            #                lambda m: 9 <= EventPatterns._total_corners(m) <= 11),
-            # EventCondition("corner_range_12_plus", "Corner range 12+", "corner_range", EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) >= 12),
-            #
-            # # --- odd_even_corners ---
-            # EventCondition("corners_odd", "Total corners odd", "odd_even_corners", EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) % 2 == 1),
-            # EventCondition("corners_even", "Total corners even", "odd_even_corners", EventType.CORNERS,
-            #                lambda m: EventPatterns._total_corners(m) % 2 == 0),
-
-            # Add more patterns as needed...
-        ]
+    def get_half_time_patterns() -> Tuple[EventCondition, ...]:
+        """Patterns that read per-half goals, for a second pass over matches that have half data"""
+        return _HALF_TIME_PATTERNS
 
     # Real data methods - these should use actual API data
 
@@ -736,6 +956,154 @@ class EventPatterns:
         return match.second_half.home_corners + match.second_half.away_corners
 
     @staticmethod
-    def get_pattern_by_name(name: str) -> EventCondition:
-        patterns = {p.name: p for p in EventPatterns.get_all_patterns()}
-        return patterns.get(name)
+    def classify_market(market: str, match: Match) -> List[str]:
+        """Names of one market's patterns that hold for this match, by table lookup where the market allows"""
+        table = _MARKET_TABLES.get(market)
+        if table is not None:
+            return list(table[_MARKET_KEYS[market](match.score_home, match.score_away)])
+        names = []
+        for pattern in EventPatterns.BY_MARKET.get(market, ()):
+            if pattern.condition(match):
+                names.append(pattern.name)
+                if market in EXCLUSIVE_MARKETS:
+                    break
+        return names
+
+    @staticmethod
+    def get_pattern_by_name(name: str) -> Optional[EventCondition]:
+        index = PATTERN_INDEX.get(name)
+        return _ALL_PATTERNS[index] if index is not None else None
+
+
+def _score_probe(home: int, away: int) -> Match:
+    """Bare match with only a full-time score, for evaluating full-time patterns ahead of time"""
+    return Match(id=0, league="", league_id=0, season=0, date="", home_team="", home_team_id=0,
+                 away_team="", away_team_id=0, score_home=home, score_away=away, status="")
+
+
+def _market_table(patterns: Sequence[EventCondition],
+                  key: Callable[[int, int], Hashable]) -> Optional[Dict[Hashable, Tuple[str, ...]]]:
+    """Names of the market's patterns holding for each key, or None if some scorelines up to 10-10 disagree"""
+    table = {}
+    for home in range(SCORE_TABLE_MAX_GOALS + 1):
+        for away in range(SCORE_TABLE_MAX_GOALS + 1):
+            probe = _score_probe(home, away)
+            names = tuple(pattern.name for pattern in patterns if pattern.condition(probe))
+            if table.setdefault(key(home, away), names) != names:
+                return None
+    return table
+
+
+def _split_complements(patterns: List[Tuple[int, EventCondition]]
+                       ) -> Tuple[List[Tuple[int, Callable[[Match], bool]]], List[Tuple[int, int]]]:
+    """(index, condition) pairs to evaluate, and (index, source index) pairs of complements read off their source"""
+    index_by_name = {pattern.name: index for index, pattern in patterns}
+    conditions = [(index, pattern.condition) for index, pattern in patterns if pattern.negate_of not in index_by_name]
+    complements = [(index, index_by_name[pattern.negate_of]) for index, pattern in patterns
+                   if pattern.negate_of in index_by_name]
+    return conditions, complements
+
+
+class ScoreLookup:
+    """Occurring-pattern lookup: full-time-only patterns precomputed per scoreline, the others evaluated"""
+
+    def __init__(self, patterns: Sequence[EventCondition]):
+        self.names = [pattern.name for pattern in patterns]
+        # Only patterns declared on the full-time score can be tabulated; those declared on per-half goals are
+        # cached per half score, and any other condition (stats, events, ...) is evaluated on every match
+        full_time_patterns = [(index, pattern) for index, pattern in enumerate(patterns)
+                              if pattern.reads_full_time_score]
+        half_time_patterns = [(index, pattern) for index, pattern in enumerate(patterns)
+                              if pattern.columns is not None and pattern.columns <= HALF_TIME_COLUMNS]
+        grouped = {index for index, _ in full_time_patterns} | {index for index, _ in half_time_patterns}
+        self.half_time_conditions, self.half_time_complements = _split_complements(half_time_patterns)
+        self.match_conditions, self.match_complements = _split_complements(
+            [(index, pattern) for index, pattern in enumerate(patterns) if index not in grouped])
+
+        # One bitmask per (home, away) score, bit i set when pattern i holds for that full-time result
+        self.masks: Dict[Tuple[int, int], int] = {}
+        for home in range(SCORE_TABLE_MAX_GOALS + 1):
+            for away in range(SCORE_TABLE_MAX_GOALS + 1):
+                probe = _score_probe(home, away)
+                mask = 0
+                for index, pattern in full_time_patterns:
+                    if pattern.condition(probe):
+                        mask |= 1 << index
+                self.masks[home, away] = mask
+
+        # Scorelines off the table are classified market by market instead
+        self.full_time_index = {pattern.name: index for index, pattern in full_time_patterns}
+        self.full_time_markets = list(dict.fromkeys(pattern.market for _, pattern in full_time_patterns))
+
+        # Half-time pattern bitmasks per (first home, first away, second home, second away) goals
+        self.half_masks: Dict[Tuple[int, int, int, int], int] = {}
+
+        # Decoded name lists per occurrence mask; few distinct masks occur across a season
+        self._names_by_mask: Dict[int, List[str]] = {}
+
+    def occurring_pattern_names(self, match: Match) -> Optional[List[str]]:
+        """Names of the patterns that occurred in this match, in pattern order (None if the score isn't usable)"""
+        mask = self.masks.get((match.score_home, match.score_away))
+        if mask is None:
+            try:
+                mask = self.masks[match.score_home, match.score_away] = self._classify_full_time(match)
+            except Exception:
+                return None
+
+        try:
+            half_key = (match.first_half.home_goals, match.first_half.away_goals,
+                        match.second_half.home_goals, match.second_half.away_goals)
+        except AttributeError:
+            mask |= self._classify(self.half_time_conditions, self.half_time_complements, match)
+        else:
+            # Half-time patterns only read these four numbers: their helpers run once per distinct half score
+            half_mask = self.half_masks.get(half_key)
+            if half_mask is None:
+                half_mask = self.half_masks[half_key] = self._classify(
+                    self.half_time_conditions, self.half_time_complements, match)
+            mask |= half_mask
+        if self.match_conditions or self.match_complements:
+            mask |= self._classify(self.match_conditions, self.match_complements, match)
+
+        names = self._names_by_mask.get(mask)
+        if names is None:
+            names = []
+            remaining = mask
+            while remaining:
+                lowest = remaining & -remaining
+                names.append(self.names[lowest.bit_length() - 1])
+                remaining ^= lowest
+            self._names_by_mask[mask] = names
+        return list(names)
+
+    @staticmethod
+    def _classify(conditions: List[Tuple[int, Callable[[Match], bool]]], complements: List[Tuple[int, int]],
+                  match: Match) -> int:
+        """Bitmask of the conditions (and complements) holding for a match, skipping those that fail on its data"""
+        mask = failed = 0
+        for index, condition in conditions:
+            try:
+                if condition(match):
+                    mask |= 1 << index
+            except Exception:
+                failed |= 1 << index
+        for index, source in complements:
+            if not (mask | failed) >> source & 1:
+                mask |= 1 << index
+        return mask
+
+    def _classify_full_time(self, match: Match) -> int:
+        """Full-time pattern bitmask of a scoreline off the table, one table lookup per market"""
+        mask = 0
+        for market in self.full_time_markets:
+            for name in EventPatterns.classify_market(market, match):
+                index = self.full_time_index.get(name)
+                if index is not None:
+                    mask |= 1 << index
+        return mask
+
+
+# Only markets whose every condition is declared on the full-time score can be read off a score probe
+_MARKET_TABLES = {market: table for market, patterns in EventPatterns.BY_MARKET.items()
+                  if market in _MARKET_KEYS and all(pattern.reads_full_time_score for pattern in patterns)
+                  and (table := _market_table(patterns, _MARKET_KEYS[market])) is not None}
@@ -0,0 +1,252 @@
+import itertools
+import linecache
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.models import HalfStats, Match
+from patterns.event_patterns import EXCLUSIVE_MARKETS, EventCondition, EventPatterns, MatchScores
+
+__all__ = ['ScoreArrays', 'PARTITIONS', 'evaluate_patterns', 'compile_match_evaluator']
+
+
+# Goals are stored one byte per match; capping each column keeps sums and differences of two within int8
+_SCORE_DTYPE = np.int8
+_MAX_GOALS = 63
+
+
+@dataclass(slots=True)
+class ScoreArrays:
+    """Full-time and per-half goals of a batch of matches, one int8 array per column"""
+    home: np.ndarray
+    away: np.ndarray
+    total: np.ndarray
+    first_home: np.ndarray
+    first_away: np.ndarray
+    second_home: np.ndarray
+    second_away: np.ndarray
+    margin: np.ndarray
+
+    @classmethod
+    def from_matches(cls, matches: List[Match]) -> 'ScoreArrays':
+        def column(values):
+            goals = np.fromiter(values, dtype=_SCORE_DTYPE, count=len(matches))
+            if len(goals) and (goals.max() > _MAX_GOALS or goals.min() < -_MAX_GOALS):
+                raise OverflowError(f"goals outside ±{_MAX_GOALS} don't fit the byte-wide score arrays")
+            return goals
+
+        home = column(m.score_home for m in matches)
+        away = column(m.score_away for m in matches)
+        return cls(
+            home=home,
+            away=away,
+            total=home + away,
+            first_home=column(m.first_half.home_goals for m in matches),
+            first_away=column(m.first_half.away_goals for m in matches),
+            second_home=column(m.second_half.home_goals for m in matches),
+            second_away=column(m.second_half.away_goals for m in matches),
+            margin=home - away
+        )
+
+
+def _first_half_total(s: ScoreArrays) -> np.ndarray:
+    return s.first_home + s.first_away
+
+
+def _second_half_total(s: ScoreArrays) -> np.ndarray:
+    return s.second_home + s.second_away
+
+
+# Markets whose patterns split every match exactly one way: a classifier maps each match to the position of
+# its pattern in the names once, and each pattern's row is that position's equality mask
+PARTITIONS: Dict[str, Tuple[Callable[[ScoreArrays], np.ndarray], Tuple[str, ...]]] = {
+    "total_goals_exact": (lambda s: np.minimum(s.total, 5),
+                          ("total_goals_0", "total_goals_1", "total_goals_2", "total_goals_3", "total_goals_4",
+                           "total_goals_5_plus")),
+    "exact_goals_home": (lambda s: np.minimum(s.home, 3),
+                         ("home_goals_0", "home_goals_1", "home_goals_2", "home_goals_3_plus")),
+    "exact_goals_away": (lambda s: np.minimum(s.away, 3),
+                         ("away_goals_0", "away_goals_1", "away_goals_2", "away_goals_3_plus")),
+    "winning_margin": (lambda s: np.clip(s.margin, -3, 3) + 3,
+                       ("win_margin_away_3_plus", "win_margin_away_2", "win_margin_away_1", "win_margin_draw",
+                        "win_margin_home_1", "win_margin_home_2", "win_margin_home_3_plus")),
+    "teams_to_score": (lambda s: (s.home > 0) + 2 * (s.away > 0),
+                       ("teams_to_score_none", "teams_to_score_only_home", "teams_to_score_only_away",
+                        "teams_to_score_both")),
+    "highest_scoring_half": (lambda s: np.sign(_first_half_total(s) - _second_half_total(s)) + 1,
+                             ("highest_scoring_second", "highest_scoring_equal", "highest_scoring_first")),
+}
+
+
+def _partition_probe(first_home: int, first_away: int, second_home: int, second_away: int) -> Match:
+    """Bare match with only per-half goals and the full-time score they add up to"""
+    return Match(id=0, league="", league_id=0, season=0, date="", home_team="", home_team_id=0,
+                 away_team="", away_team_id=0, score_home=first_home + second_home,
+                 score_away=first_away + second_away, status="",
+                 first_half=HalfStats(home_goals=first_home, away_goals=first_away),
+                 second_half=HalfStats(home_goals=second_home, away_goals=second_away))
+
+
+def _check_partitions():
+    """Raise if a PARTITIONS classifier disagrees with its patterns' own conditions on every half score up to 3"""
+    probes = [_partition_probe(*goals) for goals in itertools.product(range(4), repeat=4)]
+    scores = ScoreArrays.from_matches(probes)
+    for market, (classify, names) in PARTITIONS.items():
+        category = classify(scores)
+        for position, name in enumerate(names):
+            pattern = EventPatterns.get_pattern_by_name(name)
+            if pattern is None:
+                continue  # Disabled pattern: its position is never filled
+            if pattern.market != market:
+                raise ValueError(f"PARTITIONS['{market}'] names {name}, a pattern of the {pattern.market} market")
+            if not np.array_equal(category == position, [bool(pattern.condition(probe)) for probe in probes]):
+                raise ValueError(f"PARTITIONS['{market}'] disagrees with the condition of {name}")
+
+
+_check_partitions()
+
+
+def _fill_partitions(occurred: np.ndarray, patterns: List[EventCondition], scores: ScoreArrays) -> Dict[str, int]:
+    """Fill the rows of every PARTITIONS market among the patterns, returning those rows by pattern name"""
+    row_by_name = {pattern.name: row for row, pattern in enumerate(patterns)}
+    filled = {}
+    for classify, names in PARTITIONS.values():
+        positions = [(position, name) for position, name in enumerate(names) if name in row_by_name]
+        if not positions:
+            continue
+        category = classify(scores)
+        # An equality test per position beats scattering through a row index array (measured ~7x slower)
+        for position, name in positions:
+            row = filled[name] = row_by_name[name]
+            np.equal(category, position, out=occurred[row])
+    return filled
+
+
+def _scores_row(pattern: EventCondition, scores: ScoreArrays, computed: Dict[Hashable, np.ndarray]
+                ) -> Optional[np.ndarray]:
+    """The pattern's condition over the whole batch, or None if it has no goal-column form"""
+    if pattern.negate_of is not None:
+        source = EventPatterns.get_pattern_by_name(pattern.negate_of)
+        result = _scores_row(source, scores, computed) if source is not None else None
+        return ~result if result is not None else None
+    if pattern.scores is None:
+        return None
+    # Identical comparison rows (e.g. total == 0 in four markets) and shared functions are computed once
+    key = pattern.comparison or pattern.scores
+    result = computed.get(key)
+    if result is None:
+        result = computed[key] = pattern.scores(scores)
+    return result
+
+
+def evaluate_patterns(patterns: List[EventCondition], matches: List[Match]) -> np.ndarray:
+    """(patterns x matches) occurrence matrix: one array comparison per pattern instead of one call per match"""
+    occurred = np.zeros((len(patterns), len(matches)), dtype=bool)
+    if not matches:
+        return occurred
+
+    scores = ScoreArrays.from_matches(matches)
+    # Results per distinct comparison row or scores function, fanned out to every pattern that shares it
+    computed: Dict[Hashable, np.ndarray] = {}
+    # Rows filled from arrays, by pattern name: complements of these are inverted rather than recomputed
+    array_rows = _fill_partitions(occurred, patterns, scores)
+    partitioned = set(array_rows.values())
+    for row, pattern in enumerate(patterns):
+        if row in partitioned:
+            continue
+        source_row = array_rows.get(pattern.negate_of)
+        if source_row is not None:
+            np.logical_not(occurred[source_row], out=occurred[row])
+            array_rows[pattern.name] = row
+            continue
+
+        result = _scores_row(pattern, scores, computed)
+        if result is not None:
+            occurred[row] = result
+            array_rows[pattern.name] = row
+            continue
+
+        # Patterns without an array form are still evaluated match by match
+        for column, match in enumerate(matches):
+            try:
+                occurred[row, column] = bool(pattern.condition(match))
+            except Exception:
+                pass
+    return occurred
+
+
+# Locals holding each comparison column in compile_match_evaluator's generated source
+_SCALAR_COLUMNS = {"home": "h", "away": "a", "total": "t", "margin": "d"}
+
+# Numbers the generated evaluators' pseudo-files, so each one's source stays in linecache under its own name
+_evaluator_numbers = itertools.count()
+
+
+def _scalar_test(comparison: Tuple[str, str, Any]) -> str:
+    column, compare, operand = comparison
+    value = _SCALAR_COLUMNS[column]
+    if compare == "between":
+        return f"{operand[0]!r} <= {value} <= {operand[1]!r}"
+    if compare == "parity":
+        return f"{value} % 2 == {operand!r}"
+    return f"{value} {compare} {operand!r}"
+
+
+def compile_match_evaluator(patterns: Sequence[EventCondition]) -> Callable[[Match], List[str]]:
+    """One generated function returning the names of the patterns a match satisfies, in pattern order.
+
+    Comparison rows are inlined on the full-time score, read once; goal-column conditions (scores) share one
+    MatchScores per match; any other pattern calls its condition; and complements (negate_of) invert the
+    result of a pattern evaluated before them. Consecutive patterns of an
+    exclusive market form an if/elif chain, so the rest of the market is skipped after a hit. It raises if any
+    condition does, so callers fall back to evaluating pattern by pattern.
+    """
+    position = {pattern.name: index for index, pattern in enumerate(patterns)}
+    # Complemented patterns keep their result in a local r<index> for the complement to invert
+    complement_source = {index: position[pattern.negate_of] for index, pattern in enumerate(patterns)
+                         if position.get(pattern.negate_of, index) < index}
+    kept = set(complement_source.values())
+
+    lines = ["def evaluate(m):",
+             "    h = m.score_home",
+             "    a = m.score_away",
+             "    t = h + a",
+             "    d = h - a"]
+    if any(pattern.scores is not None and pattern.comparison is None for pattern in patterns):
+        lines.append("    s = MatchScores(m)")
+    lines.append("    out = []")
+    chained_market = None  # Exclusive market whose if/elif chain the previous line continues
+    for index, pattern in enumerate(patterns):
+        if index in complement_source:
+            lines.append(f"    if not r{complement_source[index]}:")
+            lines.append(f"        out.append(names[{index}])")
+            chained_market = None
+            continue
+        if pattern.comparison is not None:
+            test = _scalar_test(pattern.comparison)
+        elif pattern.scores is not None:
+            test = f"scores[{index}](s)"
+        else:
+            test = f"conditions[{index}](m)"
+        if index in kept:
+            # The saved result must be computed whatever matched before it, so it starts a new chain
+            lines.append(f"    r{index} = {test}")
+            test = f"r{index}"
+            chained_market = None
+        keyword = "elif" if pattern.market is chained_market else "if"
+        lines.append(f"    {keyword} {test}:")
+        lines.append(f"        out.append(names[{index}])")
+        chained_market = pattern.market if pattern.market in EXCLUSIVE_MARKETS else None
+    lines.append("    return out")
+
+    source = "\n".join(lines) + "\n"
+    # Filed in linecache so tracebacks and debuggers show the generated lines
+    filename = f"<patterns evaluator {next(_evaluator_numbers)}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(keepends=True), filename)
+    namespace = {"MatchScores": MatchScores,
+                 "conditions": [pattern.condition for pattern in patterns],
+                 "scores": [pattern.scores for pattern in patterns],
+                 "names": [pattern.name for pattern in patterns]}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["evaluate"]
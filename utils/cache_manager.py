@@ -1,28 +1,112 @@
+import gzip
 import json
 import os
+import sqlite3
 import hashlib
 import time
-from typing import Dict, Any, Optional, List
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Hashable
 from datetime import datetime
 import logging
 
+from utils.serialization import dumps, loads
+
+# Fast gzip level: the match payloads are highly repetitive, so even light compression shrinks them a lot
+_COMPRESS_LEVEL = 3
+
+
+@dataclass(slots=True)
+class _LoadedCache:
+    """One cache file's data, lock and unsaved-changes flag, shared by every manager of that file"""
+    lock: threading.RLock
+    data: Optional[Dict[str, Any]] = None
+    dirty: bool = False
+
+
+# Loaded cache per cache file, so further managers in the same process skip the disk read
+_LOADED_CACHES: Dict[str, _LoadedCache] = {}
+_LOADED_CACHES_LOCK = threading.Lock()
+
+
+class LRUCache:
+    """Small thread-safe in-memory LRU mapping with a fixed maximum size"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value (marking it recently used) or None"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 
 class OrganizedCacheManager:
     def __init__(self, cache_dir: str = "api_cache", ttl: int = 3600):
         self.logger = logging.getLogger(__name__)
         self.cache_dir = cache_dir
         self.ttl = ttl
-        self.cache_file = os.path.join(cache_dir, "organized_cache.json")
-        self._ensure_cache_dir()
-        self._load_cache()
-
-    def _ensure_cache_dir(self):
-        """Create cache directory if it doesn't exist"""
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self.cache_file = os.path.join(cache_dir, "organized_cache.json.gz")
+        self.backup_file = self.cache_file + '.backup'
+        # Uncompressed cache written by older versions, migrated on first load
+        self.legacy_cache_file = os.path.join(cache_dir, "organized_cache.json")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with _LOADED_CACHES_LOCK:
+            cache_key = os.path.abspath(self.cache_file)
+            shared = _LOADED_CACHES.get(cache_key)
+            if shared is not None:
+                self._shared, self._lock, self.cache_data = shared, shared.lock, shared.data
+            else:
+                # The lock guards cache_data and the cache file when leagues are fetched in parallel
+                self._shared = _LoadedCache(threading.RLock())
+                self._lock = self._shared.lock
+                self._load_cache()
+                self._shared.data = self.cache_data
+                _LOADED_CACHES[cache_key] = self._shared
+        self._open_responses_db()
+
+    @property
+    def _dirty(self) -> bool:
+        """Whether any manager of this cache file has deferred changes not yet written"""
+        return self._shared.dirty
+
+    @_dirty.setter
+    def _dirty(self, dirty: bool):
+        self._shared.dirty = dirty
+
+    def _open_responses_db(self):
+        """Open the SQLite store for raw API responses (one indexed table instead of the big JSON file)"""
+        self.responses_db_file = os.path.join(self.cache_dir, "api_responses.sqlite3")
+        self._db = sqlite3.connect(self.responses_db_file, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS api_cache ("
+            "key TEXT PRIMARY KEY, endpoint TEXT, body BLOB, etag TEXT, last_modified TEXT, inserted REAL)"
+        )
+        self._db.commit()
 
     def _load_cache(self):
         """Load the organized cache from file with backup recovery"""
+        if not os.path.exists(self.cache_file) and os.path.exists(self.legacy_cache_file):
+            if self._migrate_legacy_cache():
+                return
+
         if not os.path.exists(self.cache_file):
             self.cache_data = {
                 'leagues': {},
@@ -38,32 +122,32 @@ class OrganizedCacheManager:
 
         # Try to load main cache file first
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                self.cache_data = json.load(f)
+            # Decompress while reading instead of holding the whole compressed file in memory as well
+            with gzip.open(self.cache_file, 'rb') as f:
+                raw = f.read()
+            # Parse after the file is closed, so it is not held open while decoding
+            self.cache_data = loads(raw)
             self.logger.info("Loaded organized cache from file")
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, UnicodeDecodeError, OSError, EOFError, zlib.error) as e:
             self.logger.warning(f"Failed to load cache, creating new: {e}")
             # If main cache fails, try to load from backup
-            backup_file = self.cache_file + '.backup'
-            if os.path.exists(backup_file):
+            if os.path.exists(self.backup_file):
                 try:
                     self.logger.info("Attempting to restore from backup...")
                     print("Attempting to restore from backup...")
-                    with open(backup_file, 'r', encoding='utf-8') as f:
-                        backup_data = json.load(f)
+                    with open(self.backup_file, 'rb') as f:
+                        backup_bytes = f.read()
+                    self.cache_data = loads(gzip.decompress(backup_bytes))
 
-                    # Restore backup to main file
-                    with open(self.cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(backup_data, f, indent=2, ensure_ascii=False)
-
-                    with open(self.cache_file, 'r', encoding='utf-8') as f:
-                        self.cache_data = json.load(f)
+                    # Restore backup to main file (already-encoded bytes, no re-encode or re-read)
+                    with open(self.cache_file, 'wb') as f:
+                        f.write(backup_bytes)
 
                     self.logger.info("✅ Successfully restored cache from backup")
                     print("✅ Successfully restored cache from backup")
 
 
-                except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
+                except (json.JSONDecodeError, KeyError, UnicodeDecodeError, OSError, EOFError, zlib.error) as e:
                     self.logger.warning(f"Failed to load backup cache: {e}")
                     self.logger.warning("Both main cache and backup are corrupted, creating new cache")
                     self.cache_data = {
@@ -78,6 +162,24 @@ class OrganizedCacheManager:
 
         self._save_cache()
 
+    def _migrate_legacy_cache(self) -> bool:
+        """Load an uncompressed cache from older versions and save it compressed, returning whether it loaded.
+
+        The old files are left where they are: they may be tracked in a checkout, and once the compressed file
+        exists they are no longer read.
+        """
+        try:
+            with open(self.legacy_cache_file, 'rb') as f:
+                raw = f.read()
+            self.cache_data = loads(raw)
+        except (json.JSONDecodeError, KeyError, UnicodeDecodeError, OSError) as e:
+            self.logger.warning(f"Failed to migrate legacy cache, creating new: {e}")
+            return False
+
+        self._save_cache()
+        self.logger.info("Migrated organized cache to compressed format")
+        return True
+
     def _validate_cache_data(self, cache_data: Dict[str, Any]) -> bool:
         """Validate cache data structure"""
         try:
@@ -127,91 +229,167 @@ class OrganizedCacheManager:
 
     def _save_cache(self):
         """Save the organized cache to file"""
-        try:
-            self.cache_data['metadata']['last_updated'] = datetime.now().isoformat()
+        with self._lock:
+            try:
+                self.cache_data['metadata']['last_updated'] = datetime.now().isoformat()
 
-            # Create backup before saving
-            if os.path.exists(self.cache_file):
-                backup_file = self.cache_file + '.backup'
-                os.replace(self.cache_file, backup_file)
+                # Compact encoding: the file is only read back by this class, never by hand. Encoded before
+                # any file is touched, so the file is only held open (and truncated) for the write itself
+                data = gzip.compress(dumps(self.cache_data), compresslevel=_COMPRESS_LEVEL)
 
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
-
-        except Exception as e:
-            self.logger.error(f"Failed to save cache: {e}")
-
-    def save_league_info(self, league_id: int, league_data: Dict[str, Any]):
-        """Save league information"""
-        if 'leagues' not in self.cache_data:
-            self.cache_data['leagues'] = {}
-
-        if str(league_id) not in self.cache_data['leagues']:
-            self.cache_data['leagues'][str(league_id)] = {
-                'info': league_data,
-                'seasons': {}
-            }
-            self._save_cache()
+                # Create backup before saving (a single rename; there is nothing to back up on first save)
+                try:
+                    os.replace(self.cache_file, self.backup_file)
+                except FileNotFoundError:
+                    pass
+
+                with open(self.cache_file, 'wb') as f:
+                    f.write(data)
+                self._dirty = False
+
+            except Exception as e:
+                self.logger.error(f"Failed to save cache: {e}")
+
+    def save_league_info(self, league_id: int, league_data: Dict[str, Any], defer_save: bool = False):
+        """Save league information (defer_save marks the cache dirty for a later flush() instead)"""
+        with self._lock:
+            if 'leagues' not in self.cache_data:
+                self.cache_data['leagues'] = {}
+
+            if str(league_id) not in self.cache_data['leagues']:
+                self.cache_data['leagues'][str(league_id)] = {
+                    'info': league_data,
+                    'seasons': {}
+                }
+                if defer_save:
+                    self._dirty = True
+                else:
+                    self._save_cache()
 
     def save_matches(self, league_id: int, season: int, matches_data: List[Dict[str, Any]]):
         """Save matches for a league and season"""
-        league_key = str(league_id)
-        season_key = str(season)
-
-        # Ensure league exists
-        if league_key not in self.cache_data['leagues']:
-            self.cache_data['leagues'][league_key] = {
-                'info': {},
-                'seasons': {}
-            }
+        with self._lock:
+            league_key = str(league_id)
+            season_key = str(season)
+
+            # Ensure league exists
+            if league_key not in self.cache_data['leagues']:
+                self.cache_data['leagues'][league_key] = {
+                    'info': {},
+                    'seasons': {}
+                }
 
-        # Ensure season exists
-        if season_key not in self.cache_data['leagues'][league_key]['seasons']:
-            self.cache_data['leagues'][league_key]['seasons'][season_key] = {
-                'matches': {}
-            }
+            # Ensure season exists
+            if season_key not in self.cache_data['leagues'][league_key]['seasons']:
+                self.cache_data['leagues'][league_key]['seasons'][season_key] = {
+                    'matches': {}
+                }
 
-        # Save each match
-        for match_data in matches_data:
-            match_id = match_data['fixture']['id']
-            self.cache_data['leagues'][league_key]['seasons'][season_key]['matches'][str(match_id)] = {
-                'basic_info': {
-                    'home_team': match_data['teams']['home']['name'],
-                    'away_team': match_data['teams']['away']['name'],
-                    'score_home': match_data['goals']['home'],
-                    'score_away': match_data['goals']['away'],
-                    'date': match_data['fixture']['date']
-                },
-                'fixture_data': match_data,  # Store the complete fixture data
-                'saved_at': datetime.now().isoformat()  # Track when match was saved
-            }
+            # Save each match, all stamped with one epoch timestamp for this save
+            saved_at = time.time()
+            for match_data in matches_data:
+                match_id = match_data['fixture']['id']
+                self.cache_data['leagues'][league_key]['seasons'][season_key]['matches'][str(match_id)] = {
+                    'basic_info': {
+                        'home_team': match_data['teams']['home']['name'],
+                        'away_team': match_data['teams']['away']['name'],
+                        'score_home': match_data['goals']['home'],
+                        'score_away': match_data['goals']['away'],
+                        'date': match_data['fixture']['date']
+                    },
+                    'fixture_data': match_data,  # Store the complete fixture data
+                    'saved_at': saved_at  # Track when match was saved
+                }
 
-        # Update total matches count
-        self.cache_data['metadata']['total_matches'] = self._count_processed_matches()
-        self._save_cache()
+            # Update total matches count
+            self.cache_data['metadata']['total_matches'] = self._count_processed_matches()
+            self._save_cache()
 
     def save_match_details(self, league_id: int, season: int, match_id: int,
-                           events: List[Dict], statistics: List[Dict]):
+                           events: List[Dict], statistics: List[Dict], defer_save: bool = False):
         """Save detailed match data (events and statistics)"""
-        league_key = str(league_id)
-        season_key = str(season)
-        match_key = str(match_id)
+        with self._lock:
+            league_key = str(league_id)
+            season_key = str(season)
+            match_key = str(match_id)
+
+            try:
+                if (league_key in self.cache_data['leagues'] and
+                        season_key in self.cache_data['leagues'][league_key]['seasons'] and
+                        match_key in self.cache_data['leagues'][league_key]['seasons'][season_key]['matches']):
+                    match_data = self.cache_data['leagues'][league_key]['seasons'][season_key]['matches'][match_key]
+                    match_data['events'] = events
+                    match_data['statistics'] = statistics
+                    match_data['has_details'] = True  # Mark as having details
+                    match_data['last_updated'] = time.time()
+
+                    self.logger.info(f"💾 Cached details for match {match_id}")
+                    self._dirty = True
+                    if not defer_save:
+                        self._save_cache()
+
+            except KeyError as e:
+                self.logger.warning(f"Could not save details for match {match_id}: {e}")
+
+    def save_processed_match(self, league_id: int, season: int, match_id: int,
+                             snapshot: Dict[str, Any], defer_save: bool = False):
+        """Save an already-parsed match snapshot (events, half and team stats) so cache hits skip re-parsing"""
+        with self._lock:
+            try:
+                season_data = self.cache_data['leagues'][str(league_id)]['seasons'][str(season)]
+                match_data = season_data['matches'][str(match_id)]
+            except KeyError:
+                self.logger.debug(f"Could not save processed match {match_id}: not in cache")
+                return
+
+            match_data['processed_match'] = snapshot
+            match_data['processed'] = True
+            self._dirty = True
+
+            if not defer_save:
+                self._save_cache()
 
-        try:
-            if (league_key in self.cache_data['leagues'] and
-                    season_key in self.cache_data['leagues'][league_key]['seasons'] and
-                    match_key in self.cache_data['leagues'][league_key]['seasons'][season_key]['matches']):
-                match_data = self.cache_data['leagues'][league_key]['seasons'][season_key]['matches'][match_key]
-                match_data['events'] = events
-                match_data['statistics'] = statistics
-                match_data['has_details'] = True  # Mark as having details
-                match_data['last_updated'] = datetime.now().isoformat()
-
-                self.logger.info(f"💾 Cached details for match {match_id}")
+    def flush(self):
+        """Write pending deferred changes to disk"""
+        with self._lock:
+            if self._dirty:
                 self._save_cache()
 
-        except KeyError as e:
-            self.logger.warning(f"Could not save details for match {match_id}: {e}")
+    @staticmethod
+    def _api_response_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Build a stable key for an endpoint and its query parameters"""
+        return endpoint + '?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    def get_api_response(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get a cached API response with its validators (etag, last_modified, ts), body still encoded"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, inserted FROM api_cache WHERE key = ?",
+                (self._api_response_key(endpoint, params),)
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, inserted = row
+        # Decoding is left to the caller, so expired entries replaced by a fresh response are never parsed
+        return {'body': body, 'etag': etag, 'last_modified': last_modified, 'ts': inserted}
+
+    def save_api_response(self, endpoint: str, params: Dict[str, Any], body: Dict[str, Any],
+                          etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Save a raw API response along with the headers needed to revalidate it"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO api_cache (key, endpoint, body, etag, last_modified, inserted) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._api_response_key(endpoint, params), endpoint, dumps(body), etag, last_modified, time.time())
+            )
+            self._db.commit()
+
+    def refresh_api_response(self, endpoint: str, params: Dict[str, Any]):
+        """Restart the TTL of a cached API response after a 304 Not Modified"""
+        with self._lock:
+            self._db.execute("UPDATE api_cache SET inserted = ? WHERE key = ?",
+                             (time.time(), self._api_response_key(endpoint, params)))
+            self._db.commit()
 
     def get_league_matches(self, league_id: int, season: int) -> Optional[Dict[str, Any]]:
         """Get all matches for a league and season"""
@@ -275,15 +453,20 @@ class OrganizedCacheManager:
 
     def clear_all(self):
         """Clear all cache data"""
-        self.cache_data = {
-            'leagues': {},
-            'metadata': {
-                'created_at': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
-                'total_matches': 0,
-                'total_leagues': 0
-            }
-        }
-        self._save_cache()
+        with self._lock:
+            # Cleared in place: other managers for the same file share this dict
+            self.cache_data.clear()
+            self.cache_data.update({
+                'leagues': {},
+                'metadata': {
+                    'created_at': datetime.now().isoformat(),
+                    'last_updated': datetime.now().isoformat(),
+                    'total_matches': 0,
+                    'total_leagues': 0
+                }
+            })
+            self._save_cache()
+            self._db.execute("DELETE FROM api_cache")
+            self._db.commit()
         self.logger.info("Cleared all cache data")
 
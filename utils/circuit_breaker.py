@@ -0,0 +1,37 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream for a cooldown after too many consecutive failures"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through (closed, or open long enough to try again)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # Half-open: let one trial call through and restart the cooldown
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit once the threshold is reached"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
@@ -1,12 +1,26 @@
-import json
 from typing import Any, Dict, List
 from datetime import datetime
 
+from utils.serialization import dumps
+
+
+def _default(obj: Any) -> Any:
+    """Encode types JSON has no form for: sets as lists, anything else (datetime, Decimal, ...) as str"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
 
 def save_results(results: Dict[str, Any], filename: str):
-    """Save analysis results to JSON file"""
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    """Save analysis results to a compact JSON file, encoding one league season at a time"""
+    # Only one entry's encoded bytes are in memory at once, instead of the whole document
+    with open(filename, 'wb') as f:
+        f.write(b'{')
+        for index, (key, value) in enumerate(results.items()):
+            if index:
+                f.write(b',')
+            f.write(dumps(str(key)) + b':' + dumps(value, default=_default))
+        f.write(b'}')
 
 
 def format_percentage(value: float) -> str:
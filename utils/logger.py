@@ -1,9 +1,11 @@
+import functools
 import logging
 import sys
 
 
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
-    """Setup logger with consistent configuration"""
+    """Setup logger with consistent configuration (once per name and level)"""
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
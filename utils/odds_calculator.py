@@ -8,7 +8,6 @@ from patterns.event_patterns import EventPatterns, EventCondition
 class OddsCalculator:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.patterns_by_name = {p.name: p for p in EventPatterns.get_all_patterns()}
 
         # Primary odds data from Betis vs Atletico Madrid (TOP PRIORITY)
         self.primary_odds = self._create_primary_odds_dict()
@@ -611,7 +610,7 @@ class OddsCalculator:
 
         # Get pattern objects and individual odds
         for pattern_name in combination:
-            pattern = self.patterns_by_name.get(pattern_name)
+            pattern = EventPatterns.get_pattern_by_name(pattern_name)
             if pattern:
                 pattern_objects.append(pattern)
             odds = self.find_odds_for_pattern(pattern_name)
@@ -817,7 +816,8 @@ class OddsCalculator:
     def get_all_pattern_odds(self) -> Dict[str, float]:
         """Get odds for all available patterns"""
         pattern_odds = {}
-        for pattern_name in self.patterns_by_name.keys():
+        for pattern in EventPatterns.get_all_patterns():
+            pattern_name = pattern.name
             odds = self.find_odds_for_pattern(pattern_name)
             pattern_odds[pattern_name] = odds
         return pattern_odds
\ No newline at end of file
@@ -0,0 +1,30 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: bursts up to capacity, then refills at a steady rate"""
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens per second
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        """Add the tokens earned since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def acquire(self, n: int = 1):
+        """Block until n tokens are available, then take them"""
+        with self._condition:
+            while True:
+                self._refill()
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                # Sleep (releasing the lock) until enough tokens should have accrued
+                self._condition.wait((n - self.tokens) / self.refill_rate)
@@ -5,6 +5,8 @@ from datetime import datetime
 import logging
 from pathlib import Path
 
+from utils.serialization import dumps, loads
+
 
 class ResultsManager:
     """Manages comprehensive results storage and resumption for combination analysis"""
@@ -16,35 +18,40 @@ class ResultsManager:
 
         # Set the results file path inside the results directory
         self.results_file = self.results_dir / results_file
+        self.backup_file = self.results_file.with_suffix('.json.backup')
 
         self.logger = logging.getLogger(__name__)
         self.results_data = self._load_results()
 
     def _load_results(self) -> Dict[str, Any]:
         """Load results from file, fall back to backup if main file is corrupted"""
-        backup_file = self.results_file.with_suffix('.json.backup')
+        backup_file = self.backup_file
 
         # Try to load the main file first
         if os.path.exists(self.results_file):
             try:
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.logger.info("Successfully loaded results from main file")
-                    return data
+                with open(self.results_file, 'rb') as f:
+                    raw = f.read()
+                # Parse after the file is closed, so it is not held open while decoding
+                data = loads(raw)
+                self.logger.info("Successfully loaded results from main file")
+                return data
             except (json.JSONDecodeError, KeyError) as e:
                 self.logger.warning(f"Main results file corrupted: {e}")
                 # Main file is corrupted, try backup
                 if os.path.exists(backup_file):
                     try:
-                        with open(backup_file, 'r', encoding='utf-8') as f:
-                            backup_data = json.load(f)
+                        with open(backup_file, 'rb') as f:
+                            raw = f.read()
+                        backup_data = loads(raw)
                         self.logger.info("Successfully loaded results from backup file")
                         print("Successfully loaded results from backup file")
 
                         # Restore the backup to main file
                         try:
-                            with open(self.results_file, 'w', encoding='utf-8') as f:
-                                json.dump(backup_data, f, indent=2, ensure_ascii=False)
+                            data = dumps(backup_data, indent=True)
+                            with open(self.results_file, 'wb') as f:
+                                f.write(data)
                             self.logger.info("Restored backup to main file")
                         except Exception as restore_error:
                             self.logger.warning(f"Could not restore backup: {restore_error}")
@@ -61,14 +68,16 @@ class ResultsManager:
         # Try backup if main file doesn't exist
         elif os.path.exists(backup_file):
             try:
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(backup_file, 'rb') as f:
+                    raw = f.read()
+                data = loads(raw)
                 self.logger.info("Loaded results from backup file (main file missing)")
 
                 # Restore backup to main file
                 try:
-                    with open(self.results_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
+                    encoded = dumps(data, indent=True)
+                    with open(self.results_file, 'wb') as f:
+                        f.write(encoded)
                     self.logger.info("Restored backup to main file")
                 except Exception as restore_error:
                     self.logger.warning(f"Could not restore backup: {restore_error}")
@@ -85,11 +94,12 @@ class ResultsManager:
 
     def _create_new_results(self) -> Dict[str, Any]:
         """Create a new results structure"""
+        now = datetime.now().isoformat()
         return {
             'leagues': {},
             'metadata': {
-                'created_at': datetime.now().isoformat(),
-                'last_updated': datetime.now().isoformat(),
+                'created_at': now,
+                'last_updated': now,
                 'total_leagues': 0,
                 'total_seasons': 0
             }
@@ -101,17 +111,17 @@ class ResultsManager:
             self.results_data['metadata']['last_updated'] = datetime.now().isoformat()
 
             # Optional: Create backup (without atomic operations)
-            backup_file = self.results_file.with_suffix('.json.backup')
             if os.path.exists(self.results_file):
                 try:
                     import shutil
-                    shutil.copy2(self.results_file, backup_file)
+                    shutil.copy2(self.results_file, self.backup_file)
                 except Exception as backup_error:
                     self.logger.warning(f"Could not create backup: {backup_error}")
 
-            # Direct write (no temp file)
-            with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results_data, f, indent=2, ensure_ascii=False)
+            # Direct write (no temp file), encoded before the file is opened and truncated
+            data = dumps(self.results_data, indent=True)
+            with open(self.results_file, 'wb') as f:
+                f.write(data)
 
             self.logger.debug("Results saved successfully")
 
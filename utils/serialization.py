@@ -0,0 +1,33 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+# Built once and reused by every call
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _INDENT_OPTIONS = _OPTIONS | orjson.OPT_INDENT_2
+else:
+    _ENCODER = json.JSONEncoder(ensure_ascii=False)
+    _INDENT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+    _DECODER = json.JSONDecoder()
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes (orjson when available), default converts unsupported types"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=_INDENT_OPTIONS if indent else _OPTIONS)
+    if default is not None:
+        # A default hook is part of the encoder's state, so this (rare) case needs its own encoder
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=default).encode('utf-8')
+    return (_INDENT_ENCODER if indent else _ENCODER).encode(obj).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return _DECODER.decode(data.decode('utf-8') if isinstance(data, bytes) else data)